@@ -9,7 +9,7 @@ Usage:
 import asyncio
 
 from telethon import TelegramClient
-from src.config import Config
+from src.config import Config, ensure_data_dir
 
 
 async def main():
@@ -21,6 +21,7 @@ async def main():
         print("\nPlease fill in .env file first.")
         return
 
+    ensure_data_dir()
     client = TelegramClient(
         Config.SESSION_FILE,
         Config.TELEGRAM_API_ID,
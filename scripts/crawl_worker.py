@@ -0,0 +1,74 @@
+"""Crawl worker: pulls jobs from the durable crawl queue and writes results back.
+
+The pipeline enqueues URLs when CRAWL_QUEUE_ENABLED=true and gathers
+results until its deadline. Supported topologies:
+
+- Same host as the pipeline: any number of workers open the queue
+  database (CRAWL_QUEUE_PATH, default data/crawl_queue.db) directly.
+- Other hosts: set CRAWL_QUEUE_URL and CRAWL_QUEUE_TOKEN; the worker talks
+  to the pipeline's queue server (CRAWL_QUEUE_LISTEN) over HTTP. Never put
+  the database on a network filesystem shared between hosts.
+
+Usage:
+    python -m scripts.crawl_worker [--once] [--idle-exit SECONDS]
+    python -m scripts.crawl_worker &  python -m scripts.crawl_worker &   # several local workers
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import Config
+from src.crawlers.health import HostCircuitBreaker
+from src.crawlers.queue import CrawlQueue
+from src.crawlers.queue_http import RemoteCrawlQueue
+from src.crawlers.render_worker import RenderPool
+from src.crawlers.router import QUEUE_POLL_SECONDS, process_queue_jobs, worker_id
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Crawl queue worker")
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    parser.add_argument("--idle-exit", type=float, default=0, help="exit after this many idle seconds")
+    args = parser.parse_args()
+
+    queue = RemoteCrawlQueue() if Config.CRAWL_QUEUE_URL else CrawlQueue()
+    # One Chromium pool and one host-health handle for the worker's lifetime
+    render_pool = RenderPool()
+    breaker = HostCircuitBreaker()
+    me = worker_id()
+    logger.info(f"Crawl worker {me} started")
+    idle_since = time.monotonic()
+    total = 0
+    try:
+        while True:
+            processed = await process_queue_jobs(queue, me, None, render_pool, breaker)
+            total += processed
+            if processed:
+                idle_since = time.monotonic()
+                continue
+            if args.once:
+                break
+            if args.idle_exit and time.monotonic() - idle_since > args.idle_exit:
+                break
+            await asyncio.sleep(QUEUE_POLL_SECONDS)
+    finally:
+        await asyncio.to_thread(render_pool.close)
+        breaker.close()
+        queue.close()
+        logger.info(f"Crawl worker {me} exiting after {total} jobs")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -2,20 +2,41 @@
 
 Usage:
     python -m scripts.run
+    python -m scripts.run --profile-startup   # report import time per module, don't run
 """
 
 import asyncio
+import json
 import logging
+import subprocess
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.main import run_pipeline
+from src.config import ensure_data_dir
 
 LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
 
+PROJECT_ROOT = Path(__file__).parent.parent
+ENTRY_MODULE = "src.main"
+# Imported lazily by the pipeline, in the order a full run reaches them
+SUBSYSTEMS = [
+    "telethon",
+    "src.telegram_reader",
+    "src.link_extractor",
+    "src.scoring",
+    "src.crawlers.router",
+    "trafilatura",
+    "src.archive",
+    "src.summarizer",
+    "numpy",
+    "src.telegram_sender",
+]
+TOP_MODULES = 15
+
 
 def setup_logging():
     logging.basicConfig(
@@ -27,11 +48,76 @@ def setup_logging():
     )
 
 
+def _importtime(code: str) -> list[tuple[int, int, int, str]]:
+    """Run code in a fresh interpreter under -X importtime.
+
+    Returns [(self_us, cumulative_us, depth, module)] in import order.
+    Exits with an error if the code fails, so a broken import is never recorded as 0 ms.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        sys.exit(f"Startup profile failed: `{code}` exited with {proc.returncode}\n" + "\n".join(errors[-20:]))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        head, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(head.split(":")[1]), int(cumulative), depth, name.strip()))
+    return rows
+
+
+def profile_startup() -> dict:
+    """Print cold-start import cost of the entry point and each lazily loaded subsystem."""
+    entry = _importtime(f"import {ENTRY_MODULE}")
+    entry_ms = next((cum for _, cum, depth, name in entry if depth == 0 and name == ENTRY_MODULE), 0) / 1000
+
+    print(f"Cold start: import {ENTRY_MODULE} = {entry_ms:.1f} ms\n")
+    print(f"Top {TOP_MODULES} modules by self time:")
+    for self_us, cum, _, name in sorted(entry, reverse=True)[:TOP_MODULES]:
+        print(f"  {self_us / 1000:8.1f} ms self  {cum / 1000:8.1f} ms cumulative  {name}")
+
+    # One interpreter, subsystems imported in pipeline order: each row is its incremental cost
+    code = "; ".join(f"import {m}" for m in [ENTRY_MODULE, *SUBSYSTEMS])
+    loaded = {name: cum for _, cum, depth, name in _importtime(code) if depth == 0}
+    subsystems = {m: loaded.get(m, 0) / 1000 for m in SUBSYSTEMS}
+    print("\nLazily loaded subsystems (incremental, in pipeline order):")
+    for module, ms in subsystems.items():
+        print(f"  {ms:8.1f} ms  {module}")
+
+    full_ms = entry_ms + sum(subsystems.values())
+    print(f"\nFull run import cost: {full_ms:.1f} ms")
+
+    record = {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "cold_start_ms": round(entry_ms, 1),
+        "full_import_ms": round(full_ms, 1),
+        "subsystems_ms": {m: round(ms, 1) for m, ms in subsystems.items()},
+    }
+    # Machine-readable line for benchmark tracking, plus a history in data/
+    print(f"\nstartup_profile: {json.dumps(record)}")
+    with open(ensure_data_dir() / "startup_profile.jsonl", "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
 def main():
+    if "--profile-startup" in sys.argv[1:]:
+        profile_startup()
+        return
+
     setup_logging()
     logger = logging.getLogger(__name__)
     logger.info("Starting telegram news pipeline")
 
+    from src.main import run_pipeline
+
     try:
         asyncio.run(run_pipeline())
         logger.info("Pipeline completed successfully")
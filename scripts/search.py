@@ -0,0 +1,55 @@
+"""Search the local archive of crawled content and channel messages.
+
+Usage:
+    python -m scripts.search <query> [--since YYYY-MM-DD] [--until YYYY-MM-DD] [--kind crawl|message] [--limit N]
+    python -m scripts.search "bybit AND hack" --since 2026-01-01
+    python -m scripts.search "솔라나*" --kind message
+    python -m scripts.search "" --since 2026-02-01 --until 2026-02-08
+
+Query uses SQLite FTS5 syntax (AND/OR/NOT, "phrase", prefix*).
+--since/--until match the date of the source message, for crawled pages too.
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+from src.archive import search
+
+
+def _date(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the crawl/message archive")
+    parser.add_argument("query", nargs="?", default="")
+    parser.add_argument("--since", type=_date)
+    parser.add_argument("--until", type=_date)
+    parser.add_argument("--kind", choices=["crawl", "message"])
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if not args.query and not args.since and not args.until:
+        print(__doc__)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        items = search(args.query, args.since, args.until, args.kind, args.limit)
+    except sqlite3.OperationalError as e:
+        parser.error(f"invalid query {args.query!r}: {e} (FTS5 syntax: AND/OR/NOT, \"phrase\", prefix*)")
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for item in items:
+        source = item.url or f"channel {item.channel}"
+        print(f"[{item.date[:10]}] {item.kind:7s} {item.title or '-'}")
+        print(f"  {source}")
+        print(f"  {item.snippet.replace(chr(10), ' ')[:200]}\n")
+    print(f"{len(items)} results in {elapsed:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ import logging
 from datetime import datetime, timezone, timedelta
 
 from telethon import TelegramClient
-from src.config import Config
+from src.config import Config, ensure_data_dir
 from src.link_extractor import extract_links
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
@@ -26,6 +26,7 @@ async def main():
     hours = int(sys.argv[2]) if len(sys.argv) > 2 else 24
     since = datetime.now(timezone.utc) - timedelta(hours=hours)
 
+    ensure_data_dir()
     client = TelegramClient(
         Config.SESSION_FILE,
         Config.TELEGRAM_API_ID,
@@ -44,7 +45,9 @@ async def main():
     links = extract_links(messages)
     print(f"Extracted {len(links)} links:\n")
     for link in links:
-        print(f"  [{link['source_type']:10s}] {link['url']}")
+        preview = link["preview"]
+        marker = f" (preview: {len(preview['text'])} chars)" if preview else ""
+        print(f"  [{link['source_type']:10s}] {link['url']}{marker}")
 
     await client.disconnect()
 
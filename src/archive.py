@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.config import DATA_DIR, Config, ensure_data_dir
+from src.crawlers.base import CrawlResult
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE = DATA_DIR / "archive.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    author TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL DEFAULT '',
+    source_type TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_date ON items(date);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, text, content='items', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+END;
+"""
+
+
+@dataclass
+class ArchivedItem:
+    kind: str  # crawl, message
+    url: str
+    title: str
+    author: str
+    channel: str
+    source_type: str
+    date: str
+    snippet: str
+
+
+def connect(path: Path = ARCHIVE_FILE) -> sqlite3.Connection:
+    """Open the archive, creating the schema if needed."""
+    ensure_data_dir()
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _message_key(mt: dict) -> str:
+    digest = hashlib.sha1(f"{mt['channel']}\n{mt['text']}".encode("utf-8")).hexdigest()
+    return f"msg:{digest}"
+
+
+def archive_run(
+    results: list[CrawlResult],
+    message_texts: list[dict] | None = None,
+    links: list[dict] | None = None,
+    path: Path = ARCHIVE_FILE,
+) -> int:
+    """Store successful crawl results and message texts in one transaction.
+
+    Every row is dated by its source message, so --since/--until select
+    crawled pages and messages by the same clock: a crawl row takes the date
+    of the earliest message that linked it (from links), or the archive time
+    if the URL isn't in links. Already archived URLs/messages are skipped.
+    Returns the number of new rows.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    posted: dict[str, str] = {}
+    for link in links or []:
+        if link["url"] not in posted or link["date"] < posted[link["url"]]:
+            posted[link["url"]] = link["date"]
+
+    rows = [
+        (r.url, "crawl", r.url, r.title, r.author, "", r.source_type, posted.get(r.url, now), r.text)
+        for r in results
+        if r.ok
+    ]
+    rows += [
+        (_message_key(mt), "message", "", "", "", mt["channel"], "", mt["date"], mt["text"])
+        for mt in message_texts or []
+    ]
+
+    conn = connect(path)
+    try:
+        with conn:
+            # rowcount excludes the FTS trigger inserts and ignored duplicates
+            inserted = conn.executemany(
+                "INSERT OR IGNORE INTO items"
+                " (key, kind, url, title, author, channel, source_type, date, text)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            ).rowcount
+    finally:
+        conn.close()
+
+    logger.info(f"Archived {inserted} new items ({len(rows)} candidates)")
+    return inserted
+
+
+def prune(days: int = Config.ARCHIVE_RETENTION_DAYS, path: Path = ARCHIVE_FILE) -> int:
+    """Delete archived items older than the given number of days."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    conn = connect(path)
+    try:
+        with conn:
+            deleted = conn.execute("DELETE FROM items WHERE date < ?", (cutoff,)).rowcount
+    finally:
+        conn.close()
+    if deleted:
+        logger.info(f"Pruned {deleted} archived items older than {days} days")
+    return deleted
+
+
+def search(
+    query: str = "",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    kind: str | None = None,
+    limit: int = 20,
+    path: Path = ARCHIVE_FILE,
+) -> list[ArchivedItem]:
+    """Full-text (FTS5 syntax) and/or date-range search, newest first."""
+    where: list[str] = []
+    params: list = []
+    if query:
+        where.append("items.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)")
+        params.append(query)
+    if since:
+        where.append("items.date >= ?")
+        params.append(since.isoformat())
+    if until:
+        where.append("items.date < ?")
+        params.append(until.isoformat())
+    if kind:
+        where.append("items.kind = ?")
+        params.append(kind)
+
+    sql = (
+        "SELECT kind, url, title, author, channel, source_type, date, substr(text, 1, 300)"
+        " FROM items"
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + " ORDER BY date DESC LIMIT ?"
+    )
+    params.append(limit)
+
+    conn = connect(path)
+    try:
+        return [ArchivedItem(*row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import logging
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.crawlers.base import CrawlResult
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 2**12
+SIMILARITY_THRESHOLD = 0.35
+MAX_TEXT_CHARS = 5000
+
+TOKEN_REGEX = re.compile(r"\w{2,}", re.UNICODE)
+
+
+@dataclass
+class Cluster:
+    """A group of crawl results and channel messages about the same story."""
+
+    results: list[CrawlResult] = field(default_factory=list)
+    messages: list[dict] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return len(self.results) + len(self.messages)
+
+    @property
+    def urls(self) -> list[str]:
+        return [r.url for r in self.results]
+
+
+def _tokenize(text: str) -> list[str]:
+    return TOKEN_REGEX.findall(text[:MAX_TEXT_CHARS].lower())
+
+
+def vectorize(texts: list[str], n_features: int = N_FEATURES) -> np.ndarray:
+    """Hashed TF-IDF vectors, L2-normalized. Returns (len(texts), n_features) float32."""
+    import numpy as np
+
+    buckets: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    for i, text in enumerate(texts):
+        tokens = _tokenize(text)
+        for t in set(tokens).difference(buckets):
+            # crc32 is stable across processes, unlike hash()
+            buckets[t] = zlib.crc32(t.encode("utf-8")) % n_features
+        rows.extend([i] * len(tokens))
+        cols.extend(map(buckets.__getitem__, tokens))
+
+    flat = np.asarray(rows, dtype=np.int64) * n_features + np.asarray(cols, dtype=np.int64)
+    counts = (
+        np.bincount(flat, minlength=len(texts) * n_features)
+        .astype(np.float32)
+        .reshape(len(texts), n_features)
+    )
+
+    tf = np.log1p(counts)
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + df)).astype(np.float32) + 1.0
+    vectors = tf * idf
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def assign_clusters(vectors: np.ndarray, threshold: float = SIMILARITY_THRESHOLD) -> np.ndarray:
+    """Leader clustering on the cosine similarity matrix.
+
+    Each unassigned item in order becomes a leader and takes every unassigned
+    item whose similarity to it is at least ``threshold``. Avoids the
+    chaining effect of connected components.
+    """
+    import numpy as np
+
+    n = vectors.shape[0]
+    labels = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return labels
+
+    sim = vectors @ vectors.T
+    next_label = 0
+    for i in range(n):
+        if labels[i] >= 0:
+            continue
+        members = (labels < 0) & (sim[i] >= threshold)
+        members[i] = True
+        labels[members] = next_label
+        next_label += 1
+    return labels
+
+
+def cluster_items(
+    results: list[CrawlResult],
+    message_texts: list[dict] | None = None,
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> list[Cluster]:
+    """Group successful crawl results and message texts into story clusters.
+
+    Failed crawl results are not clustered; each stays a singleton so the
+    prompt still reports it. Clusters keep the order of their first item.
+    """
+    message_texts = message_texts or []
+    ok_results = [r for r in results if r.ok]
+    texts = [f"{r.title}\n{r.text}" for r in ok_results] + [mt["text"] for mt in message_texts]
+
+    clusters: list[Cluster] = []
+    n_stories = 0
+    if texts:
+        labels = assign_clusters(vectorize(texts), threshold)
+        by_label: dict[int, Cluster] = {}
+        n_results = len(ok_results)
+        for i, label in enumerate(labels.tolist()):
+            cluster = by_label.get(label)
+            if cluster is None:
+                cluster = by_label[label] = Cluster()
+                clusters.append(cluster)
+            if i < n_results:
+                cluster.results.append(ok_results[i])
+            else:
+                cluster.messages.append(message_texts[i - n_results])
+        n_stories = len(by_label)
+
+    clusters.extend(Cluster(results=[r]) for r in results if not r.ok)
+
+    logger.info(f"Clustered {len(texts)} items into {n_stories} stories")
+    return clusters
@@ -1,4 +1,6 @@
 import os
+from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -6,21 +8,138 @@ load_dotenv()
 
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
-DATA_DIR.mkdir(exist_ok=True)
+DEFAULT_PROMPT = "summary.txt"
+
+
+@cache
+def ensure_data_dir() -> Path:
+    """Create data/ on first use instead of at import time."""
+    DATA_DIR.mkdir(exist_ok=True)
+    return DATA_DIR
+
+
+def _split_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _split_weights(value: str) -> dict[str, float]:
+    """Parse "name=1.5,other=-1" into a dict."""
+    weights = {}
+    for item in _split_list(value):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 0)
+    return weights
+
+
+@dataclass
+class Profile:
+    """One digest output: a subset of source channels, a prompt and a target channel."""
+
+    name: str
+    source_channels: list[str]
+    output_channel: str
+    prompt: str = DEFAULT_PROMPT
+
+
+def _load_profiles() -> list[Profile]:
+    """Load digest profiles from env.
+
+    PROFILES=defi,english enables multi-profile mode; each profile reads
+    PROFILE_<NAME>_SOURCE_CHANNELS, PROFILE_<NAME>_OUTPUT_CHANNEL and an
+    optional PROFILE_<NAME>_PROMPT (file name under src/prompts/).
+    Without PROFILES, a single "default" profile is built from
+    SOURCE_CHANNELS and OUTPUT_CHANNEL.
+    """
+    names = _split_list(os.getenv("PROFILES", ""))
+    if not names:
+        return [
+            Profile(
+                name="default",
+                source_channels=_split_list(os.getenv("SOURCE_CHANNELS", "")),
+                output_channel=os.getenv("OUTPUT_CHANNEL", ""),
+            )
+        ]
+
+    profiles = []
+    for name in names:
+        prefix = f"PROFILE_{name.upper()}_"
+        profiles.append(
+            Profile(
+                name=name,
+                source_channels=_split_list(os.getenv(prefix + "SOURCE_CHANNELS", "")),
+                output_channel=os.getenv(prefix + "OUTPUT_CHANNEL", ""),
+                prompt=os.getenv(prefix + "PROMPT", DEFAULT_PROMPT),
+            )
+        )
+    return profiles
 
 
 class Config:
     TELEGRAM_API_ID: int = int(os.getenv("TELEGRAM_API_ID", "0"))
     TELEGRAM_API_HASH: str = os.getenv("TELEGRAM_API_HASH", "")
     TELEGRAM_PHONE: str = os.getenv("TELEGRAM_PHONE", "")
-    SOURCE_CHANNELS: list[str] = [
-        ch.strip()
-        for ch in os.getenv("SOURCE_CHANNELS", "").split(",")
-        if ch.strip()
-    ]
     OUTPUT_CHANNEL: str = os.getenv("OUTPUT_CHANNEL", "")
+    PROFILES: list[Profile] = _load_profiles()
     SESSION_FILE: str = str(DATA_DIR / "telegram_news")
 
+    # Playwright rendering worker (separate process)
+    RENDER_WORKERS: int = int(os.getenv("RENDER_WORKERS", "1"))
+    RENDER_MAX_RSS_MB: int = int(os.getenv("RENDER_MAX_RSS_MB", "700"))
+    RENDER_JOB_TIMEOUT: float = float(os.getenv("RENDER_JOB_TIMEOUT", "90"))
+    RENDER_MAX_JOBS: int = int(os.getenv("RENDER_MAX_JOBS", "25"))
+
+    # Pre-crawl relevance scoring
+    SCORE_THRESHOLD: float = float(os.getenv("SCORE_THRESHOLD", "-1"))
+    MAX_CRAWL_LINKS: int = int(os.getenv("MAX_CRAWL_LINKS", "80"))
+    MAX_MESSAGE_TEXTS: int = int(os.getenv("MAX_MESSAGE_TEXTS", "80"))
+    CHANNEL_PRIORS: dict[str, float] = _split_weights(os.getenv("CHANNEL_PRIORS", ""))
+    DOMAIN_REPUTATION: dict[str, float] = _split_weights(os.getenv("DOMAIN_REPUTATION", ""))
+
+    # Use Telegram's webpage preview / Instant View instead of crawling when it has this much text
+    PREVIEW_MIN_TEXT_LENGTH: int = int(os.getenv("PREVIEW_MIN_TEXT_LENGTH", "400"))
+
+    # Per-host circuit breaker for repeatedly failing sites
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+    CIRCUIT_COOLDOWN_HOURS: float = float(os.getenv("CIRCUIT_COOLDOWN_HOURS", "72"))
+
+    # Durable crawl job queue shared with scripts/crawl_worker.py processes
+    CRAWL_QUEUE_ENABLED: bool = os.getenv("CRAWL_QUEUE_ENABLED", "").lower() in ("1", "true", "yes")
+    CRAWL_QUEUE_PATH: str = os.getenv("CRAWL_QUEUE_PATH", str(DATA_DIR / "crawl_queue.db"))
+    CRAWL_QUEUE_DEADLINE: float = float(os.getenv("CRAWL_QUEUE_DEADLINE", "900"))
+    CRAWL_QUEUE_LOCAL_WORK: bool = os.getenv("CRAWL_QUEUE_LOCAL_WORK", "true").lower() in ("1", "true", "yes")
+    CRAWL_LEASE_SECONDS: float = float(os.getenv("CRAWL_LEASE_SECONDS", "300"))
+    CRAWL_MAX_ATTEMPTS: int = int(os.getenv("CRAWL_MAX_ATTEMPTS", "3"))
+    # Workers on other hosts: the coordinator serves the queue over HTTP (host:port), workers set the URL
+    CRAWL_QUEUE_LISTEN: str = os.getenv("CRAWL_QUEUE_LISTEN", "")
+    CRAWL_QUEUE_URL: str = os.getenv("CRAWL_QUEUE_URL", "")
+    CRAWL_QUEUE_TOKEN: str = os.getenv("CRAWL_QUEUE_TOKEN", "")
+
+    # Sharded backfill reader for long catch-up windows
+    BACKFILL_THRESHOLD_HOURS: float = float(os.getenv("BACKFILL_THRESHOLD_HOURS", "48"))
+    BACKFILL_SHARD_HOURS: float = float(os.getenv("BACKFILL_SHARD_HOURS", "12"))
+    BACKFILL_CONCURRENCY: int = int(os.getenv("BACKFILL_CONCURRENCY", "4"))
+    BACKFILL_WAIT_TIME: float = float(os.getenv("BACKFILL_WAIT_TIME", "1"))
+    BACKFILL_TAKEOUT: bool = os.getenv("BACKFILL_TAKEOUT", "").lower() in ("1", "true", "yes")
+
+    # Summarization model cascade (first = preferred, later = faster fallbacks)
+    SUMMARY_MODELS: list[str] = _split_list(os.getenv("SUMMARY_MODELS", "sonnet,haiku"))
+    SUMMARY_TIME_BUDGET: float = float(os.getenv("SUMMARY_TIME_BUDGET", "600"))
+    SUMMARY_MAX_PROMPT_CHARS: int = int(os.getenv("SUMMARY_MAX_PROMPT_CHARS", "200000"))
+    SUMMARY_CONDENSED_ITEM_CHARS: int = int(os.getenv("SUMMARY_CONDENSED_ITEM_CHARS", "1500"))
+
+    # Local searchable archive (data/archive.db)
+    ARCHIVE_RETENTION_DAYS: int = int(os.getenv("ARCHIVE_RETENTION_DAYS", "365"))
+
+    @classmethod
+    def all_source_channels(cls) -> list[str]:
+        """Union of source channels across all profiles, in first-seen order."""
+        channels: list[str] = []
+        for profile in cls.PROFILES:
+            for ch in profile.source_channels:
+                if ch not in channels:
+                    channels.append(ch)
+        return channels
+
     @classmethod
     def validate(cls) -> list[str]:
         errors = []
@@ -30,8 +149,13 @@ class Config:
             errors.append("TELEGRAM_API_HASH is required")
         if not cls.TELEGRAM_PHONE:
             errors.append("TELEGRAM_PHONE is required")
-        if not cls.SOURCE_CHANNELS:
-            errors.append("SOURCE_CHANNELS is required")
-        if not cls.OUTPUT_CHANNEL:
-            errors.append("OUTPUT_CHANNEL is required")
+        prompts_dir = Path(__file__).parent / "prompts"
+        for profile in cls.PROFILES:
+            label = "" if profile.name == "default" else f"PROFILE_{profile.name.upper()}_"
+            if not profile.source_channels:
+                errors.append(f"{label}SOURCE_CHANNELS is required")
+            if not profile.output_channel:
+                errors.append(f"{label}OUTPUT_CHANNEL is required")
+            if not (prompts_dir / profile.prompt).is_file():
+                errors.append(f"{label}PROMPT not found: {profile.prompt}")
         return errors
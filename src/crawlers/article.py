@@ -1,7 +1,6 @@
 import logging
 
 import httpx
-import trafilatura
 
 from src.crawlers.base import CrawlResult
 
@@ -17,6 +16,28 @@ HEADERS = {
 }
 
 
+def extract_article(url: str, html: str, source_type: str = "article") -> CrawlResult:
+    """Extract main text and metadata from fetched HTML with Trafilatura."""
+    # Trafilatura pulls in lxml and language data; only load it once there is HTML to parse
+    import trafilatura
+
+    text = trafilatura.extract(html, favor_recall=True)
+    if not text:
+        return CrawlResult(url=url, source_type=source_type, error="extraction_empty")
+
+    metadata = trafilatura.extract_metadata(html)
+    title = metadata.title if metadata and metadata.title else ""
+    author = metadata.author if metadata and metadata.author else ""
+
+    return CrawlResult(
+        url=url,
+        title=title,
+        author=author,
+        text=text,
+        source_type=source_type,
+    )
+
+
 async def crawl_article(url: str) -> CrawlResult:
     """Crawl article using HTTPX + Trafilatura."""
     try:
@@ -27,21 +48,7 @@ async def crawl_article(url: str) -> CrawlResult:
             resp.raise_for_status()
             html = resp.text
 
-        text = trafilatura.extract(html, favor_recall=True)
-        if not text:
-            return CrawlResult(url=url, source_type="article", error="extraction_empty")
-
-        metadata = trafilatura.extract_metadata(html)
-        title = metadata.title if metadata and metadata.title else ""
-        author = metadata.author if metadata and metadata.author else ""
-
-        return CrawlResult(
-            url=url,
-            title=title,
-            author=author,
-            text=text,
-            source_type="article",
-        )
+        return extract_article(url, html)
     except httpx.HTTPStatusError as e:
         logger.warning(f"HTTP {e.response.status_code} for {url}")
         return CrawlResult(url=url, source_type="article", error=f"http_{e.response.status_code}")
@@ -7,7 +7,7 @@ class CrawlResult:
     title: str = ""
     author: str = ""
     text: str = ""
-    source_type: str = ""  # twitter, article, generic
+    source_type: str = ""  # twitter, article, medium, substack, mirror, generic
     error: str = ""
 
     @property
@@ -0,0 +1,48 @@
+"""SQLite helpers shared by the crawl queue and host health stores."""
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.config import ensure_data_dir
+
+
+class Connection(sqlite3.Connection):
+    """A connection that async callers can use from worker threads (asyncio.to_thread).
+
+    Calls from different threads must not interleave, so callers hold
+    ``lock`` around reads and close; transaction() holds it throughout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.RLock()
+
+
+def connect(path: Path | str) -> Connection:
+    """Open a database shared between processes; transactions are explicit (see transaction).
+
+    WAL mode coordinates through shared memory, so every process must run on
+    the host that owns the file: never open it over NFS/SMB from another host.
+    """
+    ensure_data_dir()
+    conn = sqlite3.connect(
+        path, timeout=30, isolation_level=None, check_same_thread=False, factory=Connection
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+@contextmanager
+def transaction(conn: Connection) -> Iterator[Connection]:
+    """BEGIN IMMEDIATE ... COMMIT: takes the write lock up front, so reads and writes inside are atomic."""
+    with conn.lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
@@ -0,0 +1,128 @@
+import logging
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from src.config import DATA_DIR, Config
+from src.crawlers.base import CrawlResult
+from src.crawlers.db import connect, transaction
+
+logger = logging.getLogger(__name__)
+
+HEALTH_FILE = DATA_DIR / "host_health.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'closed',
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT NOT NULL DEFAULT '',
+    opened_at REAL,
+    probe_until REAL
+);
+"""
+
+# Errors that say something about the URL, not the host
+URL_ERRORS = {"http_404", "http_410"}
+CIRCUIT_ERROR_PREFIX = "circuit_open"
+# A probe whose process died frees the half-open slot after this long
+PROBE_TIMEOUT_SECONDS = 600
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower().removeprefix("www.")
+
+
+class HostCircuitBreaker:
+    """Per-host failure tracking persisted across runs in data/host_health.db.
+
+    closed → open after ``threshold`` consecutive failures; while open, URLs
+    on that host get the cached error without any request. After
+    ``cooldown_hours`` the circuit is half-open: one URL goes through as a
+    probe, and its outcome closes or re-opens the circuit. State lives in
+    SQLite and every update is one transaction, so crawl workers on the same
+    host share it and the single half-open probe holds across processes.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = HEALTH_FILE,
+        threshold: int = Config.CIRCUIT_FAILURE_THRESHOLD,
+        cooldown_hours: float = Config.CIRCUIT_COOLDOWN_HOURS,
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown_hours * 3600
+        self.conn = connect(path)
+        self.conn.executescript(SCHEMA)
+        self._probing: set[str] = set()
+
+    def close(self) -> None:
+        with self.conn.lock:
+            self.conn.close()
+
+    def check(self, url: str, source_type: str = "article") -> CrawlResult | None:
+        """Return a cached error result if the host's circuit is open, else None (go ahead)."""
+        host = _host(url)
+        with self.conn.lock:
+            row = self.conn.execute(
+                "SELECT last_error, opened_at FROM hosts WHERE host = ? AND state = 'open'", (host,)
+            ).fetchone()
+        if not row:
+            return None
+        last_error, opened_at = row
+
+        now = time.time()
+        if now - opened_at >= self.cooldown:
+            # Half-open: whichever process claims the probe slot first sends the one request
+            with transaction(self.conn):
+                probe = self.conn.execute(
+                    "UPDATE hosts SET probe_until = ?"
+                    " WHERE host = ? AND state = 'open' AND opened_at <= ?"
+                    " AND (probe_until IS NULL OR probe_until < ?)",
+                    (now + PROBE_TIMEOUT_SECONDS, host, now - self.cooldown, now),
+                ).rowcount
+            if probe:
+                self._probing.add(host)
+                logger.info(f"Circuit half-open for {host}, probing with {url}")
+                return None
+
+        return CrawlResult(
+            url=url,
+            source_type=source_type,
+            error=f"{CIRCUIT_ERROR_PREFIX}: {last_error}",
+        )
+
+    def record(self, url: str, result: CrawlResult) -> None:
+        """Update host health from a crawl outcome.
+
+        URL errors (404/410) don't count as failures; for a half-open probe
+        they prove the host answers, so they close the circuit like a success.
+        """
+        if result.error.startswith(CIRCUIT_ERROR_PREFIX):
+            return
+        host = _host(url)
+        probing = host in self._probing
+        self._probing.discard(host)
+        if result.error in URL_ERRORS and not probing:
+            return
+
+        with transaction(self.conn):
+            if result.ok or result.error in URL_ERRORS:
+                if self.conn.execute("DELETE FROM hosts WHERE host = ?", (host,)).rowcount:
+                    logger.info(f"Circuit closed for {host}")
+                return
+
+            self.conn.execute(
+                "INSERT INTO hosts (host, failures, last_error) VALUES (?, 1, ?)"
+                " ON CONFLICT (host) DO UPDATE SET failures = failures + 1, last_error = excluded.last_error",
+                (host, result.error[:200]),
+            )
+            state, failures = self.conn.execute(
+                "SELECT state, failures FROM hosts WHERE host = ?", (host,)
+            ).fetchone()
+            if probing or (state == "closed" and failures >= self.threshold):
+                self.conn.execute(
+                    "UPDATE hosts SET state = 'open', opened_at = ?, probe_until = NULL WHERE host = ?",
+                    (time.time(), host),
+                )
+                logger.warning(f"Circuit open for {host} after {failures} failures: {result.error[:200]}")
@@ -0,0 +1,291 @@
+"""Fast-path extractors for Medium, Substack and Mirror.
+
+These platforms embed the full post as structured data (JSON-LD, Apollo
+state, __NEXT_DATA__) or expose a JSON API, so text/title/author can be
+read directly without boilerplate removal or browser rendering. Anything
+the structured parse can't handle falls back to Trafilatura on the same HTML.
+"""
+
+import json
+import logging
+import re
+from urllib.parse import urlparse
+
+import httpx
+
+from src.crawlers.article import HEADERS, extract_article
+from src.crawlers.base import CrawlResult
+
+logger = logging.getLogger(__name__)
+
+MIN_STRUCTURED_CHARS = 200
+
+ARTICLE_TYPES = {"Article", "NewsArticle", "BlogPosting", "SocialMediaPosting"}
+BLOCK_TAGS = ("h1", "h2", "h3", "h4", "p", "li", "blockquote", "pre")
+
+SUBSTACK_POST_PATH = re.compile(r"^/p/([^/?#]+)")
+MEDIUM_POST_ID = re.compile(r"(?:^|-)([0-9a-f]{8,16})$")
+APOLLO_STATE_REGEX = re.compile(r"window\.__APOLLO_STATE__\s*=\s*(\{.*?\})\s*</script>", re.S)
+
+
+def _parse_html(html: str):
+    from lxml import html as lxml_html
+
+    return lxml_html.fromstring(html)
+
+
+def _html_to_text(fragment: str) -> str:
+    """Convert an HTML fragment to plain text, one paragraph per innermost block element.
+
+    Blocks that contain other blocks (<li><p>, <blockquote><p>) are skipped so
+    their text is emitted once, by the inner block.
+    """
+    if not fragment or not fragment.strip():
+        return ""
+    doc = _parse_html(fragment)
+    blocks = [
+        el.text_content().strip() for el in doc.iter(*BLOCK_TAGS)
+        if next(el.iterdescendants(*BLOCK_TAGS), None) is None
+    ]
+    blocks = [b for b in blocks if b]
+    return "\n\n".join(blocks) if blocks else doc.text_content().strip()
+
+
+def _author_name(value) -> str:
+    """Author from JSON-LD-ish values: str, {"name": ...} or a list of those."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get("name") or value.get("displayName") or ""
+    if isinstance(value, list):
+        return ", ".join(n for n in (_author_name(v) for v in value) if n)
+    return ""
+
+
+def _result(url: str, source_type: str, title: str, author: str, text: str) -> CrawlResult | None:
+    text = (text or "").strip()
+    if len(text) < MIN_STRUCTURED_CHARS:
+        return None
+    return CrawlResult(
+        url=url,
+        title=(title or "").strip(),
+        author=(author or "").strip(),
+        text=text,
+        source_type=source_type,
+    )
+
+
+def _json_ld(doc) -> list[dict]:
+    """All JSON-LD objects in the page, with @graph lists flattened."""
+    objects: list[dict] = []
+    for script in doc.xpath('//script[@type="application/ld+json"]'):
+        try:
+            data = json.loads(script.text_content())
+        except (json.JSONDecodeError, TypeError):
+            continue
+        stack = data if isinstance(data, list) else [data]
+        while stack:
+            obj = stack.pop(0)
+            if not isinstance(obj, dict):
+                continue
+            objects.append(obj)
+            if isinstance(obj.get("@graph"), list):
+                stack.extend(obj["@graph"])
+    return objects
+
+
+def _from_json_ld(url: str, doc, source_type: str) -> CrawlResult | None:
+    for obj in _json_ld(doc):
+        types = obj.get("@type")
+        types = set(types) if isinstance(types, list) else {types}
+        if not types & ARTICLE_TYPES:
+            continue
+        result = _result(
+            url,
+            source_type,
+            obj.get("headline") or obj.get("name") or "",
+            _author_name(obj.get("author")),
+            obj.get("articleBody") or "",
+        )
+        if result:
+            return result
+    return None
+
+
+def _json_ld_meta(doc) -> tuple[str, str]:
+    """(title, author) from the first article JSON-LD object, if any."""
+    for obj in _json_ld(doc):
+        if obj.get("headline"):
+            return obj.get("headline", ""), _author_name(obj.get("author"))
+    return "", ""
+
+
+# --- Medium ---
+
+
+def _medium_post(url: str, state: dict) -> dict | None:
+    """The Post entry whose id is the trailing hex id of the URL slug, if present."""
+    slug = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+    match = MEDIUM_POST_ID.search(slug)
+    if not match:
+        return None
+    post = state.get(f"Post:{match.group(1)}")
+    return post if isinstance(post, dict) else None
+
+
+def _parse_medium(url: str, html: str) -> CrawlResult | None:
+    """Medium ships the post body as Paragraph entries in window.__APOLLO_STATE__."""
+    doc = _parse_html(html)
+    title, author = _json_ld_meta(doc)
+
+    match = APOLLO_STATE_REGEX.search(html)
+    if match:
+        try:
+            state = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            state = {}
+
+        paragraphs: list[str] = []
+        # Only the Post this URL points at: the state also holds related/recommended posts
+        post = _medium_post(url, state)
+        if post:
+            title = title or post.get("title", "")
+            for field, content in post.items():
+                if not field.startswith("content") or not isinstance(content, dict):
+                    continue
+                refs = (content.get("bodyModel") or {}).get("paragraphs") or []
+                for ref in refs:
+                    para = state.get(ref.get("__ref", "")) if isinstance(ref, dict) else None
+                    if para and para.get("text"):
+                        paragraphs.append(para["text"])
+        if not paragraphs:
+            paragraphs = [
+                v["text"] for k, v in state.items()
+                if k.startswith("Paragraph:") and isinstance(v, dict) and v.get("text")
+            ]
+        if not author:
+            author = next(
+                (v.get("name", "") for k, v in state.items()
+                 if k.startswith("User:") and isinstance(v, dict) and v.get("name")),
+                "",
+            )
+
+        result = _result(url, "medium", title, author, "\n\n".join(paragraphs))
+        if result:
+            return result
+
+    return _from_json_ld(url, doc, "medium")
+
+
+# --- Substack ---
+
+
+async def _fetch_substack_api(client: httpx.AsyncClient, url: str) -> CrawlResult | None:
+    """Substack's public post API returns body_html, title and bylines as JSON."""
+    parsed = urlparse(url)
+    match = SUBSTACK_POST_PATH.match(parsed.path)
+    if not match:
+        return None
+    api_url = f"{parsed.scheme}://{parsed.netloc}/api/v1/posts/{match.group(1)}"
+    try:
+        resp = await client.get(api_url, headers={"Accept": "application/json"})
+        resp.raise_for_status()
+        post = resp.json()
+    except (httpx.HTTPError, ValueError) as e:
+        logger.debug(f"Substack API miss for {url}: {e}")
+        return None
+
+    bylines = post.get("publishedBylines") or []
+    text = _html_to_text(post.get("body_html") or "")
+    if post.get("subtitle"):
+        text = f"{post['subtitle']}\n\n{text}"
+    return _result(url, "substack", post.get("title", ""), _author_name(bylines), text)
+
+
+def _parse_substack(url: str, html: str) -> CrawlResult | None:
+    return _from_json_ld(url, _parse_html(html), "substack")
+
+
+# --- Mirror ---
+
+
+def _find_entry(node, depth: int = 0) -> dict | None:
+    """Find the post entry in __NEXT_DATA__: the dict with the longest string "body"."""
+    if depth > 12:
+        return None
+    best = None
+    if isinstance(node, dict):
+        if isinstance(node.get("body"), str) and node.get("title"):
+            best = node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = _find_entry(child, depth + 1)
+        if found and (best is None or len(found["body"]) > len(best["body"])):
+            best = found
+    return best
+
+
+def _parse_mirror(url: str, html: str) -> CrawlResult | None:
+    """Mirror is a Next.js app; the entry (markdown body, title, author) is in __NEXT_DATA__."""
+    doc = _parse_html(html)
+    scripts = doc.xpath('//script[@id="__NEXT_DATA__"]')
+    if scripts:
+        try:
+            data = json.loads(scripts[0].text_content())
+        except json.JSONDecodeError:
+            data = None
+        entry = _find_entry(data) if data else None
+        if entry:
+            author = _author_name(entry.get("author") or (entry.get("publisher") or {}).get("member"))
+            result = _result(url, "mirror", entry.get("title", ""), author, entry["body"])
+            if result:
+                return result
+
+    return _from_json_ld(url, doc, "mirror")
+
+
+PARSERS = {
+    "medium": _parse_medium,
+    "substack": _parse_substack,
+    "mirror": _parse_mirror,
+}
+
+
+async def crawl_platform(url: str, source_type: str) -> CrawlResult:
+    """Crawl a Medium/Substack/Mirror post via its structured data, falling back to Trafilatura."""
+    try:
+        async with httpx.AsyncClient(
+            headers=HEADERS, follow_redirects=True, timeout=30
+        ) as client:
+            if source_type == "substack":
+                result = await _fetch_substack_api(client, url)
+                if result:
+                    logger.debug(f"Substack API fast path: {url}")
+                    return result
+
+            resp = await client.get(url)
+            resp.raise_for_status()
+            html = resp.text
+
+        parser = PARSERS.get(source_type)
+        if parser:
+            try:
+                result = parser(url, html)
+            except Exception as e:
+                logger.debug(f"Structured parse failed for {url}: {e}")
+                result = None
+            if result:
+                logger.debug(f"{source_type} fast path: {url}")
+                return result
+
+        return extract_article(url, html, source_type)
+    except httpx.HTTPStatusError as e:
+        logger.warning(f"HTTP {e.response.status_code} for {url}")
+        return CrawlResult(url=url, source_type=source_type, error=f"http_{e.response.status_code}")
+    except Exception as e:
+        logger.warning(f"{source_type} crawl failed for {url}: {e}")
+        return CrawlResult(url=url, source_type=source_type, error=str(e))
@@ -0,0 +1,185 @@
+import dataclasses
+import json
+import logging
+import time
+from pathlib import Path
+
+from src.config import Config
+from src.crawlers.base import CrawlResult
+from src.crawlers.db import connect, transaction
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    batch TEXT NOT NULL,
+    url TEXT NOT NULL,
+    grp TEXT,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (batch, url)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, id);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs(batch);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs(created_at);
+"""
+
+
+class CrawlQueue:
+    """Durable SQLite-backed crawl job queue with leases and retries.
+
+    Job states: pending → leased → done | failed. Workers renew their
+    leases while crawling (see extend); a leased job whose lease expires
+    (worker died) becomes claimable again until ``max_attempts`` is reached.
+    Jobs enqueued with the same group key are always claimed together.
+    Batches older than ``batch_ttl`` (the coordinator's deadline) have
+    nobody waiting for them, e.g. after the coordinator was killed, and are
+    deleted.
+
+    The database may only be opened by processes on the host that owns it
+    (WAL mode uses shared memory). Workers on other hosts go through
+    QueueServer/RemoteCrawlQueue in src.crawlers.queue_http instead.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = Config.CRAWL_QUEUE_PATH,
+        lease_seconds: float = Config.CRAWL_LEASE_SECONDS,
+        max_attempts: int = Config.CRAWL_MAX_ATTEMPTS,
+        batch_ttl: float = Config.CRAWL_QUEUE_DEADLINE,
+    ):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.batch_ttl = batch_ttl
+        self.conn = connect(path)
+        self.conn.executescript(SCHEMA)
+        with transaction(self.conn):
+            # Queue files created before jobs had groups
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+            if "grp" not in columns:
+                self.conn.execute("ALTER TABLE jobs ADD COLUMN grp TEXT")
+
+    def close(self) -> None:
+        with self.conn.lock:
+            self.conn.close()
+
+    def _expire_batches(self, now: float) -> None:
+        """Delete abandoned batches; call inside a transaction."""
+        expired = self.conn.execute(
+            "DELETE FROM jobs WHERE created_at < ?", (now - self.batch_ttl,)
+        ).rowcount
+        if expired:
+            logger.info(f"Deleted {expired} crawl jobs from abandoned batches")
+
+    def enqueue(self, batch: str, urls: list[str], groups: dict[str, str] | None = None) -> None:
+        """Add URLs to a batch. ``groups`` maps URLs to a group key within the batch (see claim)."""
+        groups = groups or {}
+        now = time.time()
+        with transaction(self.conn):
+            self._expire_batches(now)
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (batch, url, grp, created_at) VALUES (?, ?, ?, ?)",
+                [(batch, url, groups.get(url), now) for url in urls],
+            )
+
+    def claim(self, worker: str, limit: int = 1, batch: str | None = None) -> list[tuple[int, str]]:
+        """Lease up to ``limit`` claimable jobs (oldest first). Returns [(job_id, url)].
+
+        A group counts as one job: all of its claimable jobs are leased
+        together, so e.g. an author's tweets render in one browser batch.
+        """
+        now = time.time()
+        with transaction(self.conn):
+            self._expire_batches(now)
+            # Expired leases that used up their attempts are given up on
+            exhausted = json.dumps(dataclasses.asdict(CrawlResult(url="", error="lease_expired")))
+            self.conn.execute(
+                "UPDATE jobs SET state = 'failed', result = json_set(?, '$.url', url)"
+                " WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (exhausted, now, self.max_attempts),
+            )
+            claimable = self.conn.execute(
+                "SELECT id, url, batch, grp FROM jobs"
+                " WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))"
+                + (" AND batch = ?" if batch else "")
+                + " ORDER BY id",
+                (now, batch) if batch else (now,),
+            ).fetchall()
+            rows, units = [], set()
+            for job_id, url, job_batch, grp in claimable:
+                unit = (job_batch, grp) if grp is not None else job_id
+                if unit not in units:
+                    if len(units) >= limit:
+                        continue
+                    units.add(unit)
+                rows.append((job_id, url))
+            self.conn.executemany(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?,"
+                " attempts = attempts + 1 WHERE id = ?",
+                [(worker, now + self.lease_seconds, job_id) for job_id, _ in rows],
+            )
+        return rows
+
+    def extend(self, job_ids: list[int], worker: str) -> int:
+        """Renew this worker's leases on jobs still in progress. Returns how many it still holds."""
+        with transaction(self.conn):
+            return self.conn.executemany(
+                "UPDATE jobs SET lease_expires = ?"
+                " WHERE id = ? AND lease_owner = ? AND state = 'leased'",
+                [(time.time() + self.lease_seconds, job_id, worker) for job_id in job_ids],
+            ).rowcount
+
+    def complete(self, job_id: int, worker: str, result: CrawlResult) -> None:
+        """Store a result. Ignored if the lease was lost to another worker."""
+        with transaction(self.conn):
+            self.conn.execute(
+                "UPDATE jobs SET state = 'done', result = ?, lease_expires = NULL"
+                " WHERE id = ? AND lease_owner = ? AND state = 'leased'",
+                (json.dumps(dataclasses.asdict(result)), job_id, worker),
+            )
+
+    def fail(self, job_id: int, worker: str, error: str) -> None:
+        """Release a job after an exception: retry later, or fail it after max attempts."""
+        with transaction(self.conn):
+            row = self.conn.execute(
+                "SELECT url, attempts FROM jobs WHERE id = ? AND lease_owner = ? AND state = 'leased'",
+                (job_id, worker),
+            ).fetchone()
+            if not row:
+                return
+            url, attempts = row
+            if attempts >= self.max_attempts:
+                result = json.dumps(dataclasses.asdict(CrawlResult(url=url, error=error)))
+                self.conn.execute(
+                    "UPDATE jobs SET state = 'failed', result = ?, lease_expires = NULL"
+                    " WHERE id = ? AND lease_owner = ? AND state = 'leased'",
+                    (result, job_id, worker),
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE jobs SET state = 'pending', lease_owner = NULL, lease_expires = NULL"
+                    " WHERE id = ? AND lease_owner = ? AND state = 'leased'",
+                    (job_id, worker),
+                )
+
+    def results(self, batch: str) -> dict[str, CrawlResult]:
+        """Finished (done or failed) results of a batch, keyed by URL."""
+        with self.conn.lock:
+            rows = self.conn.execute(
+                "SELECT result FROM jobs WHERE batch = ? AND state IN ('done', 'failed')", (batch,)
+            ).fetchall()
+        results = {}
+        for (payload,) in rows:
+            result = CrawlResult(**json.loads(payload))
+            results[result.url] = result
+        return results
+
+    def drop(self, batch: str) -> None:
+        """Remove a batch; workers holding its leases will have their results ignored."""
+        with transaction(self.conn):
+            self.conn.execute("DELETE FROM jobs WHERE batch = ?", (batch,))
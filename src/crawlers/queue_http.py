@@ -0,0 +1,163 @@
+"""HTTP transport for crawl workers on other hosts.
+
+SQLite locking only works between processes on the host that owns the
+database file, so remote workers never open it: the coordinator serves
+claim/extend/complete/fail over HTTP (QueueServer) and remote workers use
+RemoteCrawlQueue, which has the same methods as CrawlQueue.
+"""
+
+import dataclasses
+import hmac
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from src.config import Config
+from src.crawlers.base import CrawlResult
+from src.crawlers.queue import CrawlQueue
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 30
+
+
+def _parse_listen(listen: str) -> tuple[str, int]:
+    host, _, port = listen.rpartition(":")
+    return host or "0.0.0.0", int(port)
+
+
+class QueueServer:
+    """Serve the local CrawlQueue to remote workers, in a background thread.
+
+    Every request must carry ``Authorization: Bearer <token>``. Each request
+    opens its own CrawlQueue connection, since SQLite connections can't be
+    shared between the server's threads.
+    """
+
+    def __init__(
+        self,
+        listen: str = Config.CRAWL_QUEUE_LISTEN,
+        token: str = Config.CRAWL_QUEUE_TOKEN,
+        path: str = Config.CRAWL_QUEUE_PATH,
+    ):
+        if not token:
+            raise ValueError("CRAWL_QUEUE_TOKEN is required to serve the crawl queue")
+        self.httpd = ThreadingHTTPServer(_parse_listen(listen), self._handler(token, path))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @staticmethod
+    def _handler(token: str, path: str) -> type[BaseHTTPRequestHandler]:
+        expected = f"Bearer {token}".encode()
+
+        def claim(queue: CrawlQueue, req: dict) -> dict:
+            jobs = queue.claim(req["worker"], limit=int(req.get("limit", 1)), batch=req.get("batch"))
+            return {"jobs": jobs, "lease_seconds": queue.lease_seconds}
+
+        def extend(queue: CrawlQueue, req: dict) -> dict:
+            return {"held": queue.extend(req["job_ids"], req["worker"])}
+
+        def complete(queue: CrawlQueue, req: dict) -> dict:
+            queue.complete(req["job_id"], req["worker"], CrawlResult(**req["result"]))
+            return {}
+
+        def fail(queue: CrawlQueue, req: dict) -> dict:
+            queue.fail(req["job_id"], req["worker"], req["error"])
+            return {}
+
+        routes = {"/claim": claim, "/extend": extend, "/complete": complete, "/fail": fail}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                auth = self.headers.get("Authorization", "").encode()
+                if not hmac.compare_digest(auth, expected):
+                    return self._reply(401, {"error": "unauthorized"})
+                route = routes.get(self.path)
+                if not route:
+                    return self._reply(404, {"error": "not found"})
+                try:
+                    req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    queue = CrawlQueue(path)
+                    try:
+                        body = route(queue, req)
+                    finally:
+                        queue.close()
+                except (ValueError, KeyError, TypeError) as e:
+                    return self._reply(400, {"error": str(e)})
+                except Exception as e:
+                    logger.error(f"Crawl queue {self.path} failed: {e}")
+                    return self._reply(500, {"error": str(e)})
+                self._reply(200, body)
+
+            def _reply(self, status: int, body: dict) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        return Handler
+
+    def start(self) -> None:
+        self.thread.start()
+        host, port = self.httpd.server_address[:2]
+        logger.info(f"Serving crawl queue on {host}:{port}")
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class RemoteCrawlQueue:
+    """CrawlQueue client for workers on other hosts (see QueueServer).
+
+    The coordinator only serves while a run is crawling, so an unreachable
+    server reads as an empty queue and lost writes as lost leases.
+    """
+
+    def __init__(self, url: str = Config.CRAWL_QUEUE_URL, token: str = Config.CRAWL_QUEUE_TOKEN):
+        self.lease_seconds = Config.CRAWL_LEASE_SECONDS
+        self.client = httpx.Client(
+            base_url=url,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=REQUEST_TIMEOUT,
+        )
+
+    def _post(self, path: str, body: dict) -> dict | None:
+        try:
+            resp = self.client.post(path, json=body)
+            resp.raise_for_status()
+            return resp.json()
+        except httpx.ConnectError as e:
+            # Expected between runs for claims; a lost write means the lease will expire
+            log = logger.debug if path == "/claim" else logger.warning
+            log(f"Crawl queue server unreachable ({path}): {e}")
+        except httpx.HTTPError as e:
+            logger.warning(f"Crawl queue {path} failed: {e}")
+        return None
+
+    def close(self) -> None:
+        self.client.close()
+
+    def claim(self, worker: str, limit: int = 1, batch: str | None = None) -> list[tuple[int, str]]:
+        reply = self._post("/claim", {"worker": worker, "limit": limit, "batch": batch})
+        if not reply:
+            return []
+        self.lease_seconds = reply["lease_seconds"]
+        return [(job_id, url) for job_id, url in reply["jobs"]]
+
+    def extend(self, job_ids: list[int], worker: str) -> int:
+        reply = self._post("/extend", {"job_ids": job_ids, "worker": worker})
+        return reply["held"] if reply else 0
+
+    def complete(self, job_id: int, worker: str, result: CrawlResult) -> None:
+        self._post("/complete", {"job_id": job_id, "worker": worker, "result": dataclasses.asdict(result)})
+
+    def fail(self, job_id: int, worker: str, error: str) -> None:
+        self._post("/fail", {"job_id": job_id, "worker": worker, "error": error})
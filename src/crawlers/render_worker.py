@@ -0,0 +1,258 @@
+"""Isolated, memory-capped Playwright rendering worker.
+
+Chromium runs in a separate supervised process instead of the pipeline
+process. The supervisor sends one job at a time over a pipe, enforces a
+per-job timeout and an RSS ceiling on the worker's whole process tree
+(Chromium included), and recycles the worker after N jobs. A runaway page
+costs that job's URLs, not the run.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from pathlib import Path
+
+from src.config import Config
+from src.crawlers.base import CrawlResult
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.25
+MAX_CONSECUTIVE_CRASHES = 3
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+SOURCE_TYPES = {"twitter": "twitter", "page": "generic"}
+
+
+def _children(pid: int) -> list[int]:
+    children: list[int] = []
+    for task in Path(f"/proc/{pid}/task").glob("*"):
+        try:
+            children.extend(int(c) for c in (task / "children").read_text().split())
+        except (OSError, ValueError):
+            continue
+    return children
+
+
+def tree_rss_bytes(pid: int) -> int:
+    """Resident memory of a process and all its descendants (Linux /proc; 0 elsewhere)."""
+    total = 0
+    stack = [pid]
+    while stack:
+        p = stack.pop()
+        try:
+            total += int(Path(f"/proc/{p}/statm").read_text().split()[1]) * PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            continue
+        stack.extend(_children(p))
+    return total
+
+
+async def render_page(url: str, browser) -> CrawlResult:
+    """Use Playwright to render JS-heavy pages."""
+    try:
+        context = await browser.new_context()
+        page = await context.new_page()
+        await page.goto(url, wait_until="networkidle", timeout=30000)
+
+        title = await page.title()
+        # Extract main text content
+        text = await page.evaluate("""
+            () => {
+                const article = document.querySelector('article') || document.querySelector('main') || document.body;
+                return article.innerText;
+            }
+        """)
+        await context.close()
+
+        if not text or len(text.strip()) < 50:
+            return CrawlResult(url=url, source_type="generic", error="fallback_empty")
+
+        return CrawlResult(url=url, title=title, text=text.strip(), source_type="generic")
+    except Exception as e:
+        logger.warning(f"Playwright fallback failed for {url}: {e}")
+        return CrawlResult(url=url, source_type="generic", error=f"fallback_{e}")
+
+
+# --- Worker process side ---
+
+
+async def _handle(job: dict, browser) -> list[CrawlResult]:
+    from src.crawlers.twitter import crawl_twitter_group
+
+    kind = job["kind"]
+    if kind == "twitter":
+        return await crawl_twitter_group(job["urls"], browser)
+    if kind == "page":
+        return [await render_page(url, browser) for url in job["urls"]]
+    raise ValueError(f"Unknown render job kind: {kind}")
+
+
+async def _serve(conn) -> None:
+    from playwright.async_api import async_playwright
+
+    pw = await async_playwright().start()
+    browser = await pw.chromium.launch(headless=True)
+    try:
+        while True:
+            try:
+                job = await asyncio.to_thread(conn.recv)
+            except EOFError:
+                break
+            if job is None:
+                break
+            try:
+                results = await _handle(job, browser)
+            except Exception as e:
+                source_type = SOURCE_TYPES.get(job.get("kind"), "generic")
+                results = [CrawlResult(url=u, source_type=source_type, error=str(e)) for u in job["urls"]]
+            conn.send([dataclasses.asdict(r) for r in results])
+    finally:
+        await browser.close()
+        await pw.stop()
+
+
+def _worker_main(conn) -> None:
+    # Own process group, so the supervisor can kill Chromium together with us
+    if hasattr(os, "setsid"):
+        os.setsid()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s[render]: %(message)s")
+    asyncio.run(_serve(conn))
+
+
+# --- Supervisor side ---
+
+
+class RenderWorker:
+    """Supervises one rendering worker process."""
+
+    def __init__(
+        self,
+        max_rss_mb: int = Config.RENDER_MAX_RSS_MB,
+        job_timeout: float = Config.RENDER_JOB_TIMEOUT,
+        max_jobs: int = Config.RENDER_MAX_JOBS,
+    ):
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.job_timeout = job_timeout
+        self.max_jobs = max_jobs
+        self._process = None
+        self._conn = None
+        self._jobs = 0
+        self._crashes = 0
+
+    @property
+    def broken(self) -> bool:
+        """True after repeated crashes (e.g. Chromium missing); stop trying to restart."""
+        return self._crashes >= MAX_CONSECUTIVE_CRASHES
+
+    def _start(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._jobs = 0
+        logger.info(f"Started render worker pid={self._process.pid}")
+
+    def _kill(self) -> None:
+        if not self._process:
+            return
+        pid = self._process.pid
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(pid, signal.SIGKILL)
+            else:
+                self._process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+        self._process.join(timeout=5)
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def stop(self) -> None:
+        """Ask the worker to exit cleanly; kill it if it doesn't."""
+        if not self._process:
+            return
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self._process.join(timeout=10)
+        self._kill()
+
+    async def run(self, kind: str, urls: list[str]) -> list[CrawlResult]:
+        """Run one rendering job; failures come back as error results, one per URL."""
+        outcome = await self._run(kind, urls)
+        if isinstance(outcome, list):
+            return outcome
+        source_type = SOURCE_TYPES.get(kind, "generic")
+        return [CrawlResult(url=u, source_type=source_type, error=outcome) for u in urls]
+
+    async def _run(self, kind: str, urls: list[str]) -> list[CrawlResult] | str:
+        if self.broken:
+            return "render_unavailable"
+        if not self._process or not self._process.is_alive():
+            self._kill()
+            self._start()
+
+        self._conn.send({"kind": kind, "urls": urls})
+        deadline = time.monotonic() + self.job_timeout * len(urls)
+
+        while True:
+            if self._conn.poll():
+                try:
+                    payload = self._conn.recv()
+                except (EOFError, OSError):
+                    payload = None
+                if payload is not None:
+                    break
+            if not self._process.is_alive():
+                logger.error(f"Render worker crashed on {urls[0]}")
+                self._crashes += 1
+                self._kill()
+                return "render_crashed"
+            rss = tree_rss_bytes(self._process.pid)
+            if rss > self.max_rss:
+                logger.error(
+                    f"Render worker over memory limit ({rss // 2**20} MB) on {urls[0]}, restarting"
+                )
+                self._kill()
+                return "render_memory_limit"
+            if time.monotonic() > deadline:
+                logger.error(f"Render job timed out after {self.job_timeout}s on {urls[0]}, restarting")
+                self._kill()
+                return "render_timeout"
+            await asyncio.sleep(POLL_INTERVAL)
+
+        self._crashes = 0
+        self._jobs += 1
+        if self._jobs >= self.max_jobs:
+            logger.info(f"Recycling render worker after {self._jobs} jobs")
+            await asyncio.to_thread(self.stop)
+        return [CrawlResult(**r) for r in payload]
+
+
+class RenderPool:
+    """A small pool of render workers, started lazily on first use."""
+
+    def __init__(self, size: int = Config.RENDER_WORKERS):
+        self._idle: asyncio.Queue[RenderWorker] = asyncio.Queue()
+        self._workers = [RenderWorker() for _ in range(max(1, size))]
+        for worker in self._workers:
+            self._idle.put_nowait(worker)
+
+    async def render(self, kind: str, urls: list[str]) -> list[CrawlResult]:
+        worker = await self._idle.get()
+        try:
+            return await worker.run(kind, urls)
+        finally:
+            self._idle.put_nowait(worker)
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.stop()
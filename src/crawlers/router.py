@@ -1,64 +1,230 @@
 import asyncio
 import logging
-from urllib.parse import urlparse
+import os
+import socket
+import time
+import uuid
 
+from src.config import Config
 from src.crawlers.base import CrawlResult
 from src.crawlers.article import crawl_article
-from src.crawlers.twitter import crawl_twitter
+from src.crawlers.health import HostCircuitBreaker
+from src.crawlers.platforms import PARSERS, crawl_platform
+from src.crawlers.queue import CrawlQueue
+from src.crawlers.queue_http import QueueServer, RemoteCrawlQueue
+from src.crawlers.render_worker import RenderPool
+from src.crawlers.twitter import group_status_urls
+from src.link_extractor import classify_url
 
 logger = logging.getLogger(__name__)
 
-TWITTER_DOMAINS = {"twitter.com", "x.com", "mobile.twitter.com"}
 MAX_CONCURRENT = 5
+QUEUE_POLL_SECONDS = 2
 
 
-def _is_twitter(url: str) -> bool:
-    domain = urlparse(url).netloc.lower().removeprefix("www.")
-    return domain in TWITTER_DOMAINS
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
 
 
 async def crawl_urls(urls: list[str]) -> list[CrawlResult]:
-    """Crawl multiple URLs with concurrency control and fallback."""
-    sem = asyncio.Semaphore(MAX_CONCURRENT)
-    browser = None
-    pw = None
+    """Crawl URLs locally, or through the durable job queue if CRAWL_QUEUE_ENABLED."""
+    if Config.CRAWL_QUEUE_ENABLED:
+        return await crawl_via_queue(urls)
+    return await crawl_local(urls)
+
+
+async def _renew_leases(queue: CrawlQueue | RemoteCrawlQueue, worker: str, job_ids: list[int]) -> None:
+    """Heartbeat: keep the leases on a batch alive while it's being crawled."""
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        held = await asyncio.to_thread(queue.extend, job_ids, worker)
+        if held < len(job_ids):
+            logger.warning(f"{worker} lost {len(job_ids) - held}/{len(job_ids)} leases")
+
+
+async def process_queue_jobs(
+    queue: CrawlQueue | RemoteCrawlQueue,
+    worker: str,
+    batch: str | None = None,
+    render_pool: RenderPool | None = None,
+    breaker: HostCircuitBreaker | None = None,
+) -> int:
+    """Claim up to MAX_CONCURRENT jobs, crawl them locally and store the results.
+
+    Long-running workers pass their own render_pool and breaker so Chromium
+    and host health are reused across batches (see crawl_local). Leases are
+    renewed every third of the lease period until the results are stored,
+    so slow batches (render timeouts scale with batch size) aren't handed
+    to another worker. Returns the number of jobs processed (0 when the
+    queue has nothing claimable).
+    """
+    # Queue calls block (SQLite lock waits, HTTP round trips), so they run in threads
+    jobs = await asyncio.to_thread(queue.claim, worker, limit=MAX_CONCURRENT, batch=batch)
+    if not jobs:
+        return 0
+    heartbeat = asyncio.create_task(_renew_leases(queue, worker, [job_id for job_id, _ in jobs]))
+    try:
+        results = await crawl_local([url for _, url in jobs], render_pool, breaker)
+    except Exception as e:
+        logger.error(f"Crawl batch failed on {worker}: {e}")
+        for job_id, _ in jobs:
+            await asyncio.to_thread(queue.fail, job_id, worker, str(e))
+        return len(jobs)
+    finally:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+    for (job_id, _), result in zip(jobs, results):
+        await asyncio.to_thread(queue.complete, job_id, worker, result)
+    return len(jobs)
+
+
+async def crawl_via_queue(urls: list[str]) -> list[CrawlResult]:
+    """Coordinator: enqueue URLs as one batch and gather results until the deadline.
+
+    Unless CRAWL_QUEUE_LOCAL_WORK is off, this process also works through
+    its own batch alongside any scripts/crawl_worker.py processes. With
+    CRAWL_QUEUE_LISTEN set, the queue is also served over HTTP for workers
+    on other hosts while the batch is open. URLs without a result by
+    CRAWL_QUEUE_DEADLINE come back as queue_deadline errors.
+    """
+    queue = CrawlQueue()
+    server = None
+    if Config.CRAWL_QUEUE_LISTEN:
+        try:
+            server = QueueServer()
+            server.start()
+        except (OSError, ValueError) as e:
+            logger.error(f"Can't serve crawl queue on {Config.CRAWL_QUEUE_LISTEN}: {e}")
+            server = None
+    render_pool = RenderPool()
+    breaker = HostCircuitBreaker()
+    batch = uuid.uuid4().hex
+    me = worker_id()
+    deadline = time.monotonic() + Config.CRAWL_QUEUE_DEADLINE
+    try:
+        # Same-author tweets are claimed together so they render in one browser batch
+        twitter_groups = group_status_urls([u for u in urls if classify_url(u) == "twitter"])
+        groups = {url: str(i) for i, group in enumerate(twitter_groups) for url in group}
+        await asyncio.to_thread(queue.enqueue, batch, urls, groups)
+        logger.info(f"Queued {len(urls)} URLs as batch {batch[:8]}")
+
+        done: dict[str, CrawlResult] = {}
+        while time.monotonic() < deadline:
+            done = await asyncio.to_thread(queue.results, batch)
+            if len(done) >= len(set(urls)):
+                break
+            processed = 0
+            if Config.CRAWL_QUEUE_LOCAL_WORK:
+                # A claimed render batch may outlast the deadline; cut it off there
+                try:
+                    processed = await asyncio.wait_for(
+                        process_queue_jobs(queue, me, batch, render_pool, breaker),
+                        deadline - time.monotonic(),
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("Local crawl work cut off at the queue deadline")
+                    continue
+            if not processed:
+                await asyncio.sleep(max(0, min(QUEUE_POLL_SECONDS, deadline - time.monotonic())))
+        else:
+            done = await asyncio.to_thread(queue.results, batch)
+            logger.warning(f"Crawl queue deadline reached: {len(done)}/{len(set(urls))} URLs done")
+    finally:
+        if server:
+            server.stop()
+        await asyncio.to_thread(queue.drop, batch)
+        queue.close()
+        await asyncio.to_thread(render_pool.close)
+        breaker.close()
+
+    final = [done.get(url) or CrawlResult(url=url, error="queue_deadline") for url in urls]
+    ok_count = sum(1 for r in final if r.ok)
+    logger.info(f"Crawled {len(final)} URLs via queue: {ok_count} ok, {len(final) - ok_count} failed")
+    return final
 
-    twitter_urls = [u for u in urls if _is_twitter(u)]
-    article_urls = [u for u in urls if not _is_twitter(u)]
 
-    # Launch shared browser if there are twitter URLs
-    if twitter_urls:
-        try:
-            from playwright.async_api import async_playwright
-            pw = await async_playwright().start()
-            browser = await pw.chromium.launch(headless=True)
-        except Exception as e:
-            logger.error(f"Failed to launch browser: {e}")
+async def crawl_local(
+    urls: list[str],
+    render_pool: RenderPool | None = None,
+    breaker: HostCircuitBreaker | None = None,
+) -> list[CrawlResult]:
+    """Crawl multiple URLs in this process with concurrency control and fallback.
+
+    Browser rendering (tweets, JS-heavy fallbacks) goes through an isolated
+    render worker process that is only started if a URL needs it. Renders
+    wait on the render pool (RENDER_WORKERS jobs at once), not on the
+    MAX_CONCURRENT fetch slots, so HTTP crawls never queue behind them. Tweets
+    are rendered in batches that reuse loaded pages (see group_status_urls).
+    Hosts with an open circuit (see HostCircuitBreaker) are skipped.
+    A render_pool or breaker passed in is left open for the caller's next
+    batch; ones created here are closed when the call returns.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+    own_pool = render_pool is None
+    own_breaker = breaker is None
+    render_pool = render_pool or RenderPool()
+    breaker = breaker or HostCircuitBreaker()
+
+    twitter_groups = group_status_urls([u for u in urls if classify_url(u) == "twitter"])
+    other_urls = [u for u in urls if classify_url(u) != "twitter"]
+
+    async def _crawl_twitter(group: list[str]) -> list[CrawlResult]:
+        results = await render_pool.render("twitter", group)
+        # A crashed/timed-out group job shouldn't cost every URL in it
+        if len(group) > 1 and any(r.error.startswith("render_") for r in results):
+            logger.info(f"Retrying {len(group)} tweets individually after {results[0].error}")
+            retried = []
+            for r in results:
+                if r.error.startswith("render_"):
+                    [r] = await render_pool.render("twitter", [r.url])
+                retried.append(r)
+            results = retried
+        return results
 
     async def _crawl_one(url: str) -> CrawlResult:
+        source_type = classify_url(url)
         async with sem:
-            if _is_twitter(url):
-                result = await crawl_twitter(url, browser=browser)
+            # Checked once a slot is free, so failures recorded meanwhile can open the circuit
+            cached = await asyncio.to_thread(breaker.check, url, source_type)
+            if cached:
+                return cached
+            if source_type in PARSERS:
+                result = await crawl_platform(url, source_type)
             else:
                 result = await crawl_article(url)
-                # Fallback to Playwright if article extraction failed
-                if not result.ok and result.error == "extraction_empty" and browser:
-                    logger.info(f"Article fallback to Playwright: {url}")
-                    result = await _playwright_fallback(url, browser)
-            return result
+        # Fallback to Playwright if article extraction failed (outside sem: the pool is its own limit)
+        if not result.ok and result.error == "extraction_empty":
+            logger.info(f"Article fallback to Playwright: {url}")
+            [result] = await render_pool.render("page", [url])
+        await asyncio.to_thread(breaker.record, url, result)
+        return result
 
-    tasks = [_crawl_one(url) for url in urls]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    if twitter_groups:
+        logger.info(f"Twitter: {sum(map(len, twitter_groups))} URLs in {len(twitter_groups)} render batches")
 
-    # Clean up shared browser
-    if browser:
-        await browser.close()
-    if pw:
-        await pw.stop()
+    try:
+        group_results, results = await asyncio.gather(
+            asyncio.gather(*(_crawl_twitter(g) for g in twitter_groups), return_exceptions=True),
+            asyncio.gather(*(_crawl_one(u) for u in other_urls), return_exceptions=True),
+        )
+    finally:
+        # Shut down render workers (and their Chromium) unless the caller owns them
+        if own_pool:
+            await asyncio.to_thread(render_pool.close)
+        if own_breaker:
+            breaker.close()
+
+    by_url: dict[str, CrawlResult | BaseException] = dict(zip(other_urls, results))
+    for group, r in zip(twitter_groups, group_results):
+        if isinstance(r, BaseException):
+            by_url.update((url, r) for url in group)
+        else:
+            by_url.update((res.url, res) for res in r)
 
     final = []
-    for url, r in zip(urls, results):
-        if isinstance(r, Exception):
+    for url in urls:
+        r = by_url[url]
+        if isinstance(r, BaseException):
             logger.error(f"Crawl exception for {url}: {r}")
             final.append(CrawlResult(url=url, error=str(r)))
         else:
@@ -67,29 +233,3 @@ async def crawl_urls(urls: list[str]) -> list[CrawlResult]:
     ok_count = sum(1 for r in final if r.ok)
     logger.info(f"Crawled {len(final)} URLs: {ok_count} ok, {len(final) - ok_count} failed")
     return final
-
-
-async def _playwright_fallback(url: str, browser) -> CrawlResult:
-    """Fallback: use Playwright to render JS-heavy pages."""
-    try:
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto(url, wait_until="networkidle", timeout=30000)
-
-        title = await page.title()
-        # Extract main text content
-        text = await page.evaluate("""
-            () => {
-                const article = document.querySelector('article') || document.querySelector('main') || document.body;
-                return article.innerText;
-            }
-        """)
-        await context.close()
-
-        if not text or len(text.strip()) < 50:
-            return CrawlResult(url=url, source_type="generic", error="fallback_empty")
-
-        return CrawlResult(url=url, title=title, text=text.strip(), source_type="generic")
-    except Exception as e:
-        logger.warning(f"Playwright fallback failed for {url}: {e}")
-        return CrawlResult(url=url, source_type="generic", error=f"fallback_{e}")
@@ -1,89 +1,232 @@
 import logging
+import re
+from urllib.parse import urlparse
 
 from src.crawlers.base import CrawlResult
 
 logger = logging.getLogger(__name__)
 
-
-async def crawl_twitter(url: str, browser=None) -> CrawlResult:
-    """Crawl tweet using Playwright with stealth."""
+STATUS_PATH = re.compile(r"^/([^/]+)/status(?:es)?/(\d+)")
+
+# Tweets read in one render job; the job timeout scales with the batch size
+MAX_BATCH_URLS = 10
+
+# Map each rendered tweet to its status ID: an article's own timestamp link, and
+# quoted-tweet cards (div[role="link"] inside the article) that expose a status link
+EXTRACT_STATUSES_JS = """
+(ids) => {
+    const out = {};
+    // First match that belongs to el itself, not to a quote card nested in it
+    const own = (el, selector) => [...el.querySelectorAll(selector)].find((node) => {
+        const card = node.closest('div[role="link"]');
+        return !card || card === el || !el.contains(card);
+    });
+    const read = (el, id) => {
+        if (!ids.includes(id) || out[id]) return;
+        const textEl = own(el, '[data-testid="tweetText"]');
+        const userEl = own(el, '[data-testid="User-Name"]');
+        if (!textEl) return;
+        out[id] = {
+            text: textEl.innerText.trim(),
+            author: userEl ? userEl.innerText.split('\\n')[0].trim() : '',
+        };
+    };
+    const statusId = (a) => {
+        const m = (a.getAttribute('href') || '').match(/\\/status\\/(\\d+)/);
+        return m ? m[1] : null;
+    };
+    for (const article of document.querySelectorAll('article')) {
+        for (const card of article.querySelectorAll('div[role="link"]')) {
+            for (const a of card.querySelectorAll('a[href*="/status/"]')) {
+                const id = statusId(a);
+                if (id) read(card, id);
+            }
+        }
+        for (const time of article.querySelectorAll('a[href*="/status/"] time')) {
+            const link = time.closest('a');
+            if (link.closest('div[role="link"]')) continue;
+            const id = statusId(link);
+            if (id) read(article, id);
+            break;
+        }
+    }
+    return out;
+}
+"""
+
+
+def parse_status(url: str) -> tuple[str, str] | None:
+    """(handle, status_id) for a tweet URL, or None."""
+    match = STATUS_PATH.match(urlparse(url).path)
+    if not match:
+        return None
+    return match.group(1).lower(), match.group(2)
+
+
+def group_status_urls(urls: list[str]) -> list[list[str]]:
+    """Pack tweet URLs into render batches of up to MAX_BATCH_URLS, keeping each author together.
+
+    One batch runs in one browser context, so a status already rendered on
+    another batch member's page (same-author thread, reply chain, quoted
+    tweet) costs no navigation of its own; see crawl_twitter_group. An
+    author with more than MAX_BATCH_URLS tweets gets a batch of their own.
+    """
+    by_author: dict[str, list[str]] = {}
+    for url in urls:
+        parsed = parse_status(url)
+        # x.com/i/web/status/<id> carries no author; non-status URLs neither
+        by_author.setdefault(parsed[0] if parsed and parsed[0] != "i" else f"#{url}", []).append(url)
+
+    batches: list[list[str]] = []
+    for group in sorted(by_author.values(), key=len, reverse=True):
+        target = next((b for b in batches if len(b) + len(group) <= MAX_BATCH_URLS), None)
+        if target is None:
+            batches.append(list(group))
+        else:
+            target.extend(group)
+    return batches
+
+
+async def _new_context(browser):
+    context = await browser.new_context(
+        user_agent=(
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+        ),
+        viewport={"width": 1280, "height": 900},
+        locale="en-US",
+    )
+
+    # Stealth: mask webdriver detection
+    await context.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', { get: () => false });
+        Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
+        Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+    """)
+    return context
+
+
+async def _load_status(page, url: str) -> None:
+    # Normalize URL: x.com -> twitter.com for better compatibility
+    normalized_url = url.replace("x.com", "twitter.com")
+    await page.goto(normalized_url, wait_until="domcontentloaded", timeout=30000)
+
+    # Wait for tweet content to load
     try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        return CrawlResult(url=url, source_type="twitter", error="playwright_not_installed")
-
-    own_browser = browser is None
+        await page.wait_for_selector('[data-testid="tweetText"]', timeout=15000)
+    except Exception:
+        # Try alternative: maybe it's a thread or quote tweet
+        await page.wait_for_selector("article", timeout=10000)
+
+
+async def _extract_page(page) -> tuple[str, str]:
+    """All tweet texts on the page plus the first author's display name.
+
+    Fallback for pages where the requested status can't be located.
+    """
+    tweet_els = await page.query_selector_all('[data-testid="tweetText"]')
+    texts = []
+    for el in tweet_els:
+        t = await el.inner_text()
+        if t:
+            texts.append(t.strip())
+
+    text = "\n\n".join(texts) if texts else ""
+
+    # Extract author
+    author = ""
+    author_el = await page.query_selector('[data-testid="User-Name"]')
+    if author_el:
+        author = (await author_el.inner_text()).strip()
+        # Usually "DisplayName\n@handle" — take just the first line as display name
+        if "\n" in author:
+            author = author.split("\n")[0]
+    return text, author
+
+
+def _tweet_result(url: str, text: str, author: str) -> CrawlResult:
+    if not text:
+        return CrawlResult(url=url, source_type="twitter", error="no_tweet_text")
+    return CrawlResult(
+        url=url,
+        title=f"Tweet by {author}" if author else "Tweet",
+        author=author,
+        text=text,
+        source_type="twitter",
+    )
+
+
+async def crawl_twitter_group(urls: list[str], browser) -> list[CrawlResult]:
+    """Crawl a batch of tweets with as few page loads as possible.
+
+    Every result is the requested status's own text, whether it was read
+    from its own page or from another one; only when a loaded status can't
+    be located in the DOM does it fall back to all tweet text on its page.
+
+    Authors with several tweets get one load of their newest status first
+    (its conversation page renders the earlier thread above it). The rest
+    are loaded newest first, and after every load all still-missing statuses
+    are read from the DOM, so replies and quoted tweets by other authors are
+    picked up from the page that shows them. Returns one result per URL.
+    """
+    ids = {url: parsed[1] for url in urls if (parsed := parse_status(url))}
+    results: dict[str, CrawlResult] = {}
+
+    def _take(found: dict[str, dict]) -> None:
+        for url, status_id in ids.items():
+            status = found.get(status_id)
+            if url not in results and status and status.get("text"):
+                results[url] = _tweet_result(url, status["text"], status.get("author", ""))
+
+    async def _load(url: str) -> None:
+        await _load_status(page, url)
+        pending = [ids[u] for u in ids if u not in results]
+        if pending:
+            _take(await page.evaluate(EXTRACT_STATUSES_JS, pending))
 
     try:
-        pw = None
-        if own_browser:
-            pw = await async_playwright().start()
-            browser = await pw.chromium.launch(headless=True)
-
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1280, "height": 900},
-            locale="en-US",
-        )
-
-        # Stealth: mask webdriver detection
-        await context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => false });
-            Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
-            Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-        """)
+        context = await _new_context(browser)
+    except Exception as e:
+        logger.warning(f"Twitter crawl failed for {urls[0]}: {e}")
+        return [CrawlResult(url=u, source_type="twitter", error=str(e)) for u in urls]
 
+    loads = 0
+    try:
         page = await context.new_page()
 
-        # Normalize URL: x.com -> twitter.com for better compatibility
-        normalized_url = url.replace("x.com", "twitter.com")
-        await page.goto(normalized_url, wait_until="domcontentloaded", timeout=30000)
-
-        # Wait for tweet content to load
-        try:
-            await page.wait_for_selector('[data-testid="tweetText"]', timeout=15000)
-        except Exception:
-            # Try alternative: maybe it's a thread or quote tweet
-            await page.wait_for_selector("article", timeout=10000)
-
-        # Extract tweet text
-        tweet_els = await page.query_selector_all('[data-testid="tweetText"]')
-        texts = []
-        for el in tweet_els:
-            t = await el.inner_text()
-            if t:
-                texts.append(t.strip())
-
-        text = "\n\n".join(texts) if texts else ""
-
-        # Extract author
-        author = ""
-        author_el = await page.query_selector('[data-testid="User-Name"]')
-        if author_el:
-            author = (await author_el.inner_text()).strip()
-            # Usually "DisplayName\n@handle" — take just the first line as display name
-            if "\n" in author:
-                author = author.split("\n")[0]
-
+        by_author: dict[str, list[str]] = {}
+        for url in ids:
+            handle = parse_status(url)[0]
+            if handle != "i":
+                by_author.setdefault(handle, []).append(url)
+        for group in sorted(by_author.values(), key=len, reverse=True):
+            remaining = [u for u in group if u not in results]
+            if len(remaining) < 2:
+                continue
+            anchor = max(remaining, key=lambda u: int(ids[u]))
+            try:
+                loads += 1
+                await _load(anchor)
+            except Exception as e:
+                logger.warning(f"Twitter conversation load failed for {anchor}: {e}")
+
+        # Newest first: a reply or quote tweet renders the older status it references
+        rest = sorted((u for u in urls if u not in results), key=lambda u: -int(ids.get(u, 0)))
+        for url in rest:
+            if url in results:
+                continue
+            try:
+                loads += 1
+                await _load(url)
+                if url not in results:
+                    text, author = await _extract_page(page)
+                    results[url] = _tweet_result(url, text, author)
+            except Exception as e:
+                logger.warning(f"Twitter crawl failed for {url}: {e}")
+                results[url] = CrawlResult(url=url, source_type="twitter", error=str(e))
+    finally:
         await context.close()
-        if own_browser and pw:
-            await browser.close()
-            await pw.stop()
-
-        if not text:
-            return CrawlResult(url=url, source_type="twitter", error="no_tweet_text")
 
-        return CrawlResult(
-            url=url,
-            title=f"Tweet by {author}" if author else "Tweet",
-            author=author,
-            text=text,
-            source_type="twitter",
-        )
-
-    except Exception as e:
-        logger.warning(f"Twitter crawl failed for {url}: {e}")
-        return CrawlResult(url=url, source_type="twitter", error=str(e))
+    if len(urls) > 1:
+        logger.info(f"Twitter batch: {len(urls)} statuses in {loads} page loads")
+    return [results[url] for url in urls]
@@ -1,16 +1,20 @@
+from __future__ import annotations
+
 import re
 import logging
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
-from telethon.tl.types import (
-    Message,
-    MessageEntityUrl,
-    MessageEntityTextUrl,
-)
+from src.config import Config
+from src.crawlers.base import CrawlResult
+
+if TYPE_CHECKING:
+    from telethon.tl.types import Message
 
 logger = logging.getLogger(__name__)
 
 URL_REGEX = re.compile(r"https?://[A-Za-z0-9][^\s<>\"'\)\]]*")
+CONTEXT_LENGTH = 300
 
 TWITTER_DOMAINS = {"twitter.com", "x.com", "mobile.twitter.com"}
 MEDIUM_DOMAINS = {"medium.com"}
@@ -72,11 +76,89 @@ def _utf16_extract(text: str, offset: int, length: int) -> str:
     return encoded[start_byte:end_byte].decode("utf-16-le")
 
 
+def _rich_text(rt) -> str:
+    """Flatten Telegram RichText (TextPlain/TextBold/TextConcat/...) to a string."""
+    if rt is None:
+        return ""
+    if isinstance(rt, str):
+        return rt
+    if hasattr(rt, "texts"):
+        return "".join(_rich_text(t) for t in rt.texts)
+    return _rich_text(getattr(rt, "text", None))
+
+
+def _page_text(blocks) -> list[str]:
+    """Paragraph texts of an Instant View page, in order (captions and media skipped)."""
+    parts: list[str] = []
+    for block in blocks or []:
+        if hasattr(block, "items"):  # PageBlockList / PageBlockOrderedList
+            for item in block.items:
+                if hasattr(item, "blocks"):
+                    parts.extend(_page_text(item.blocks))
+                else:
+                    parts.append(_rich_text(getattr(item, "text", None)))
+        elif hasattr(block, "blocks"):  # PageBlockDetails, PageBlockCollage, ...
+            parts.extend(_page_text(block.blocks))
+        elif hasattr(block, "cover"):
+            parts.extend(_page_text([block.cover]))
+        elif hasattr(block, "text"):
+            parts.append(_rich_text(block.text))
+    return [p.strip() for p in parts if p and p.strip()]
+
+
+def _normalize_url(url: str) -> str:
+    parsed = urlparse(url)
+    return parsed.netloc.lower().removeprefix("www.") + parsed.path.rstrip("/")
+
+
+def extract_preview(msg: Message) -> dict | None:
+    """Webpage preview Telegram attached to the message: {url, title, author, site_name, text}.
+
+    ``text`` is the Instant View body when Telegram has one, else the description.
+    """
+    from telethon.tl.types import MessageMediaWebPage, WebPage
+
+    media = getattr(msg, "media", None)
+    if not isinstance(media, MessageMediaWebPage) or not isinstance(media.webpage, WebPage):
+        return None
+    page = media.webpage
+    text = ""
+    if page.cached_page:
+        text = "\n\n".join(_page_text(page.cached_page.blocks))
+    if not text:
+        text = page.description or ""
+    return {
+        "url": page.url,
+        "title": page.title or "",
+        "author": page.author or "",
+        "site_name": page.site_name or "",
+        "text": text.strip(),
+    }
+
+
+def preview_result(link: dict) -> CrawlResult | None:
+    """Turn a link's Telegram preview into a CrawlResult if it has enough text to skip crawling."""
+    preview = link.get("preview")
+    if not preview or len(preview["text"]) < Config.PREVIEW_MIN_TEXT_LENGTH:
+        return None
+    return CrawlResult(
+        url=link["url"],
+        title=preview["title"],
+        author=preview["author"] or preview["site_name"],
+        text=preview["text"],
+        source_type=link["source_type"],
+    )
+
+
 def extract_links(messages: list[Message]) -> list[dict]:
     """Extract and deduplicate URLs from messages.
 
-    Returns list of dicts: {url, source_type, channel, date}
+    Returns list of dicts: {url, source_type, channel, date, preview, context, views, forwards}
+    where preview is the message's Telegram webpage preview for that URL (or None)
+    and context is the message text around the link.
     """
+    from telethon.tl.types import MessageEntityUrl, MessageEntityTextUrl
+
     seen_urls: set[str] = set()
     links: list[dict] = []
 
@@ -106,6 +188,8 @@ def extract_links(messages: list[Message]) -> list[dict]:
         if not urls_in_msg:
             urls_in_msg = URL_REGEX.findall(msg.text)
 
+        preview = extract_preview(msg)
+
         # Validate, deduplicate, and classify
         for url in urls_in_msg:
             # Clean trailing punctuation
@@ -131,11 +215,22 @@ def extract_links(messages: list[Message]) -> list[dict]:
             if msg.peer_id and hasattr(msg.peer_id, "channel_id"):
                 channel_name = str(msg.peer_id.channel_id)
 
+            # Telegram previews one link per message; match it by URL (or the only URL)
+            link_preview = None
+            if preview and (
+                _normalize_url(preview["url"]) == _normalize_url(url) or len(urls_in_msg) == 1
+            ):
+                link_preview = preview
+
             links.append({
                 "url": url,
                 "source_type": classify_url(url),
                 "channel": channel_name,
                 "date": msg.date.isoformat(),
+                "preview": link_preview,
+                "context": URL_REGEX.sub("", msg.text).strip()[:CONTEXT_LENGTH],
+                "views": msg.views or 0,
+                "forwards": msg.forwards or 0,
             })
 
     logger.info(f"Extracted {len(links)} unique links from {len(messages)} messages")
@@ -148,7 +243,7 @@ MIN_TEXT_LENGTH = 30
 def extract_message_texts(messages: list[Message]) -> list[dict]:
     """Extract message texts that have meaningful content (with or without links).
 
-    Returns list of dicts: {text, channel, date}
+    Returns list of dicts: {text, channel, date, views, forwards}
     """
     texts = []
     seen = set()
@@ -176,6 +271,8 @@ def extract_message_texts(messages: list[Message]) -> list[dict]:
             "text": clean,
             "channel": channel_name,
             "date": msg.date.isoformat(),
+            "views": msg.views or 0,
+            "forwards": msg.forwards or 0,
         })
 
     logger.info(f"Extracted {len(texts)} message texts from {len(messages)} messages")
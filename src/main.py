@@ -1,20 +1,32 @@
 import asyncio
 import logging
 
-from telethon import TelegramClient
-from telethon.errors import FloodWaitError
-
-from src.config import Config
+from src.config import Config, Profile, ensure_data_dir
 from src.state import load_last_run, save_last_run
-from src.telegram_reader import read_messages
-from src.link_extractor import extract_links, extract_message_texts
-from src.crawlers.router import crawl_urls
-from src.summarizer import summarize
-from src.telegram_sender import send_summary
+from src.crawlers.base import CrawlResult
+
+# Heavy subsystems (Telethon, crawlers, NumPy, summarizer) are imported at
+# their point of use, so empty runs and tooling don't pay for them.
 
 logger = logging.getLogger(__name__)
 
 
+async def _summarize_profile(
+    profile: Profile,
+    links: list[dict],
+    message_texts: list[dict],
+    results_by_url: dict[str, CrawlResult],
+) -> str | None:
+    """Summarize one profile's digest from the shared crawl results."""
+    from src.summarizer import summarize
+
+    results = [results_by_url[link["url"]] for link in links if link["url"] in results_by_url]
+    logger.info(
+        f"[{profile.name}] Summarizing {len(results)} crawled + {len(message_texts)} messages"
+    )
+    return await summarize(results, message_texts, prompt=profile.prompt)
+
+
 async def run_pipeline() -> None:
     """Run the full news aggregation pipeline."""
     # Validate config
@@ -29,6 +41,11 @@ async def run_pipeline() -> None:
     logger.info(f"Last run: {last_run.isoformat()}")
 
     # 2. Connect to Telegram
+    from telethon import TelegramClient
+    from telethon.errors import FloodWaitError
+    from src.telegram_reader import read_channel_messages, merge_messages
+
+    ensure_data_dir()
     client = TelegramClient(
         Config.SESSION_FILE,
         Config.TELEGRAM_API_ID,
@@ -37,44 +54,101 @@ async def run_pipeline() -> None:
     await client.start(phone=Config.TELEGRAM_PHONE)
 
     try:
-        # 3. Read messages from source channels
+        # 3. Read messages once from the union of all profiles' source channels
+        channels = Config.all_source_channels()
         try:
-            messages = await read_messages(client, last_run)
+            by_channel = await read_channel_messages(client, last_run, channels)
         except FloodWaitError as e:
             logger.warning(f"FloodWaitError: waiting {e.seconds}s")
             await asyncio.sleep(e.seconds)
-            messages = await read_messages(client, last_run)
+            by_channel = await read_channel_messages(client, last_run, channels)
 
-        if not messages:
+        if not any(by_channel.values()):
             logger.info("No new messages found")
             save_last_run()
             return
 
-        # 4. Extract links and message texts
-        links = extract_links(messages)
-        message_texts = extract_message_texts(messages)
-
-        if not links and not message_texts:
+        # 4. Extract links and message texts per profile, keeping only relevant ones
+        from src.link_extractor import extract_links, extract_message_texts, preview_result
+        from src.scoring import filter_relevant, resolve_channel_priors
+
+        inputs: dict[str, tuple[list[dict], list[dict]]] = {}
+        channel_priors = resolve_channel_priors(by_channel)
+        for profile in Config.PROFILES:
+            messages = merge_messages(by_channel, profile.source_channels)
+            links, message_texts = filter_relevant(
+                extract_links(messages),
+                extract_message_texts(messages),
+                channel_priors,
+            )
+            if not links and not message_texts:
+                logger.info(f"[{profile.name}] No links or meaningful text found")
+                continue
+            inputs[profile.name] = (links, message_texts)
+
+        if not inputs:
             logger.info("No links or meaningful text found")
             save_last_run()
             return
 
-        # 5. Crawl URLs
-        results = []
-        if links:
-            urls = [link["url"] for link in links]
+        # 5. Use Telegram previews where usable, crawl the rest of the URL union once
+        results_by_url: dict[str, CrawlResult] = {}
+        for links, _ in inputs.values():
+            for link in links:
+                if link["url"] not in results_by_url:
+                    preview = preview_result(link)
+                    if preview:
+                        results_by_url[link["url"]] = preview
+
+        urls: list[str] = []
+        seen: set[str] = set(results_by_url)
+        for links, _ in inputs.values():
+            for link in links:
+                if link["url"] not in seen:
+                    seen.add(link["url"])
+                    urls.append(link["url"])
+
+        if results_by_url:
+            logger.info(f"Using Telegram previews for {len(results_by_url)} URLs")
+        if urls:
             logger.info(f"Found {len(urls)} unique URLs to crawl")
-            results = await crawl_urls(urls)
+            from src.crawlers.router import crawl_urls
 
-        # 6. Summarize with Claude
-        summary = await summarize(results, message_texts)
-        if not summary:
-            logger.error("Summarization failed, skipping send")
-            save_last_run()
-            return
+            results = await crawl_urls(urls)
+            results_by_url.update((r.url, r) for r in results)
 
-        # 7. Send to output channel
-        await send_summary(client, summary)
+        # Archive crawled content and message texts for later search
+        try:
+            from src.archive import archive_run, prune
+
+            all_links = [link for links, _ in inputs.values() for link in links]
+            all_texts = [mt for _, texts in inputs.values() for mt in texts]
+            archive_run(list(results_by_url.values()), all_texts, all_links)
+            prune()
+        except Exception as e:
+            logger.warning(f"Archive failed: {e}")
+
+        # 6. Summarize each profile concurrently from the shared results
+        profiles = [p for p in Config.PROFILES if p.name in inputs]
+        summaries = await asyncio.gather(
+            *(
+                _summarize_profile(p, *inputs[p.name], results_by_url)
+                for p in profiles
+            ),
+            return_exceptions=True,
+        )
+
+        # 7. Send each digest to its output channel
+        from src.telegram_sender import send_summary
+
+        for profile, summary in zip(profiles, summaries):
+            if isinstance(summary, Exception):
+                logger.error(f"[{profile.name}] Summarization error: {summary}")
+                continue
+            if not summary:
+                logger.error(f"[{profile.name}] Summarization failed, skipping send")
+                continue
+            await send_summary(client, summary, channel=profile.output_channel)
 
         # 8. Save state
         save_last_run()
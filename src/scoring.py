@@ -0,0 +1,176 @@
+"""Cheap local relevance scoring before any network work.
+
+Links and message texts are scored from keyword lexicons, URL shape and
+domain reputation, per-channel priors and message engagement
+(views/forwards relative to the channel's median). Only items above
+Config.SCORE_THRESHOLD are kept, capped at the top-N by score.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+from statistics import median
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlparse
+
+from src.config import Config
+
+if TYPE_CHECKING:
+    from telethon.tl.types import Message
+
+logger = logging.getLogger(__name__)
+
+SPAM_PATTERNS = re.compile(
+    r"referr?al|ref(?:erral)?\s*code|invite\s*code|promo\s*code|giveaway|"
+    r"claim\s+(?:your|free)|sign\s*up\s+(?:now|bonus)|join\s+now|limited\s+time|"
+    r"bonus|free\s+(?:usdt|btc|eth|tokens?)|whitelist\s+spots?|dm\s+(?:me|us)|"
+    r"추천인|레퍼럴|초대\s*코드|가입\s*(?:이벤트|보너스)|이벤트\s*참여|에어드랍\s*참여|선착순|광고|#?\bad\b",
+    re.IGNORECASE,
+)
+NEWS_PATTERNS = re.compile(
+    r"\bSEC\b|\bETF\b|\bCFTC\b|hack(?:ed)?|exploit|drain(?:ed)?|mainnet|upgrade|hard\s*fork|"
+    r"launch(?:es|ed)?|acquir(?:es|ed)|acquisition|raises?|funding|series\s+[ABC]|"
+    r"regulat|lawsuit|approv(?:al|ed|es)|partnership|integrat|delist|listing|"
+    r"규제|승인|해킹|출시|메인넷|업그레이드|투자\s*유치|인수|소송|상장|파트너십",
+    re.IGNORECASE,
+)
+
+# Not bare "ref": Ghost blogs and aggregators append ?ref=<source> to ordinary links
+REFERRAL_PARAMS = {"referral", "referralcode", "ref_code", "invite", "invitecode", "aff", "affiliate"}
+# Whole path segments only: /join scores, /join-us-for-ethcc doesn't
+REFERRAL_PATHS = re.compile(
+    r"/(?:register|signup|sign-up|join|invite|referral|activity/referral)(?:/|$)", re.IGNORECASE
+)
+
+DOMAIN_REPUTATION = {
+    "coindesk.com": 1.5,
+    "theblock.co": 1.5,
+    "blockworks.co": 1.5,
+    "decrypt.co": 1.0,
+    "cointelegraph.com": 1.0,
+    "dlnews.com": 1.0,
+    "bloomberg.com": 1.5,
+    "reuters.com": 1.5,
+    "ft.com": 1.0,
+    "wsj.com": 1.0,
+    "github.com": 1.0,
+    "sec.gov": 1.5,
+    "medium.com": 0.5,
+    "substack.com": 0.5,
+    "mirror.xyz": 0.5,
+}
+
+SPAM_WEIGHT = -2.0
+NEWS_WEIGHT = 1.0
+NEWS_CAP = 3.0
+REFERRAL_WEIGHT = -3.0
+ENGAGEMENT_WEIGHT = 0.5
+FORWARD_WEIGHT = 0.3
+
+
+def _lexicon_score(text: str) -> float:
+    spam = len(SPAM_PATTERNS.findall(text))
+    news = len(NEWS_PATTERNS.findall(text))
+    return spam * SPAM_WEIGHT + min(news * NEWS_WEIGHT, NEWS_CAP)
+
+
+def _domain_score(domain: str, reputation: dict[str, float]) -> float:
+    # Match the domain or any parent domain (e.g. foo.substack.com → substack.com)
+    parts = domain.split(".")
+    for i in range(len(parts) - 1):
+        candidate = ".".join(parts[i:])
+        if candidate in reputation:
+            return reputation[candidate]
+    return 0.0
+
+
+def _url_score(url: str, reputation: dict[str, float]) -> float:
+    parsed = urlparse(url)
+    score = _domain_score(parsed.netloc.lower().removeprefix("www."), reputation)
+    params = {k.lower() for k in parse_qs(parsed.query)}
+    if params & REFERRAL_PARAMS or REFERRAL_PATHS.search(parsed.path):
+        score += REFERRAL_WEIGHT
+    return score
+
+
+def _engagement_scores(items: list[dict]) -> list[float]:
+    """Views relative to the channel's median (log2, clipped) plus a forwards bonus."""
+    views_by_channel: dict[str, list[int]] = {}
+    for item in items:
+        if item.get("views"):
+            views_by_channel.setdefault(item["channel"], []).append(item["views"])
+    medians = {ch: median(v) for ch, v in views_by_channel.items()}
+
+    scores = []
+    for item in items:
+        score = FORWARD_WEIGHT * math.log1p(item.get("forwards", 0))
+        base = medians.get(item["channel"])
+        if base and item.get("views"):
+            ratio = math.log2((item["views"] + 1) / (base + 1))
+            score += ENGAGEMENT_WEIGHT * max(-1.0, min(2.0, ratio))
+        scores.append(score)
+    return scores
+
+
+def resolve_channel_priors(by_channel: dict[str, list[Message]]) -> dict[str, float]:
+    """Map Config.CHANNEL_PRIORS (keyed by username) to the channel IDs used in link/text dicts."""
+    priors: dict[str, float] = {}
+    for channel, prior in Config.CHANNEL_PRIORS.items():
+        priors[channel] = prior
+        for msg in by_channel.get(channel, [])[:1]:
+            if msg.peer_id and hasattr(msg.peer_id, "channel_id"):
+                priors[str(msg.peer_id.channel_id)] = prior
+    return priors
+
+
+def score_links(links: list[dict], channel_priors: dict[str, float] | None = None) -> list[float]:
+    channel_priors = channel_priors or {}
+    reputation = {**DOMAIN_REPUTATION, **Config.DOMAIN_REPUTATION}
+    engagement = _engagement_scores(links)
+    return [
+        _url_score(link["url"], reputation)
+        + _lexicon_score(link.get("context", ""))
+        + channel_priors.get(link["channel"], 0.0)
+        + eng
+        for link, eng in zip(links, engagement)
+    ]
+
+
+def score_texts(texts: list[dict], channel_priors: dict[str, float] | None = None) -> list[float]:
+    channel_priors = channel_priors or {}
+    engagement = _engagement_scores(texts)
+    return [
+        _lexicon_score(mt["text"]) + channel_priors.get(mt["channel"], 0.0) + eng
+        for mt, eng in zip(texts, engagement)
+    ]
+
+
+def select(items: list[dict], scores: list[float], threshold: float, top_n: int) -> list[dict]:
+    """Items scoring at least ``threshold``, best ``top_n`` by score, in original order."""
+    ranked = sorted(
+        (i for i, score in enumerate(scores) if score >= threshold),
+        key=lambda i: scores[i],
+        reverse=True,
+    )[:top_n]
+    return [items[i] for i in sorted(ranked)]
+
+
+def filter_relevant(
+    links: list[dict],
+    message_texts: list[dict],
+    channel_priors: dict[str, float] | None = None,
+) -> tuple[list[dict], list[dict]]:
+    """Score and select links and message texts before crawling/summarizing."""
+    kept_links = select(
+        links, score_links(links, channel_priors), Config.SCORE_THRESHOLD, Config.MAX_CRAWL_LINKS
+    )
+    kept_texts = select(
+        message_texts, score_texts(message_texts, channel_priors), Config.SCORE_THRESHOLD, Config.MAX_MESSAGE_TEXTS
+    )
+    logger.info(
+        f"Relevance filter: kept {len(kept_links)}/{len(links)} links, "
+        f"{len(kept_texts)}/{len(message_texts)} message texts"
+    )
+    return kept_links, kept_texts
@@ -3,7 +3,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from src.config import DATA_DIR
+from src.config import DATA_DIR, ensure_data_dir
 
 logger = logging.getLogger(__name__)
 
@@ -27,5 +27,6 @@ def save_last_run(dt: datetime | None = None) -> None:
     """Save current timestamp to state file."""
     if dt is None:
         dt = datetime.now(timezone.utc)
+    ensure_data_dir()
     STATE_FILE.write_text(json.dumps({"last_run": dt.isoformat()}, indent=2))
     logger.info(f"Saved last_run: {dt.isoformat()}")
@@ -1,20 +1,112 @@
 import asyncio
+import json
 import logging
 import os
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from src.clustering import Cluster, cluster_items
+from src.config import DATA_DIR, DEFAULT_PROMPT, Config, ensure_data_dir
 from src.crawlers.base import CrawlResult
 
 logger = logging.getLogger(__name__)
 
 TIMEOUT_SECONDS = 300
-PROMPT_TEMPLATE = (Path(__file__).parent / "prompts" / "summary.txt").read_text
+RELATED_SNIPPET_CHARS = 300
+PROMPTS_DIR = Path(__file__).parent / "prompts"
 
+LATENCY_FILE = DATA_DIR / "model_latency.json"
+LATENCY_SAMPLES = 50
+MIN_LATENCY_SAMPLES = 3
+MIN_ATTEMPT_SECONDS = 30
+# Skipped tiers get no new samples, so old ones must expire for the tier to be retried
+LATENCY_MAX_AGE_DAYS = 7
 
-async def call_claude(prompt: str, model: str = "sonnet") -> str | None:
+
+def load_prompt(name: str = DEFAULT_PROMPT) -> str:
+    """Load a prompt template from src/prompts/."""
+    return (PROMPTS_DIR / name).read_text()
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+def load_latency() -> dict:
+    """Per-model latency samples and percentiles from data/model_latency.json."""
+    if LATENCY_FILE.exists():
+        try:
+            return json.loads(LATENCY_FILE.read_text())
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.warning(f"Failed to load latency stats: {e}")
+    return {}
+
+
+def _fresh(samples: list[dict]) -> list[dict]:
+    """Samples newer than LATENCY_MAX_AGE_DAYS (undated samples count as expired)."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=LATENCY_MAX_AGE_DAYS)).isoformat()
+    return [s for s in samples if s.get("at", "") >= cutoff]
+
+
+def record_latency(model: str, prompt_chars: int, seconds: float, ok: bool) -> None:
+    """Append a latency sample (timeouts count at the timeout value) and refresh percentiles."""
+    stats = load_latency()
+    entry = stats.setdefault(model, {"samples": []})
+    entry["samples"] = (
+        _fresh(entry["samples"])
+        + [{
+            "chars": prompt_chars,
+            "seconds": round(seconds, 1),
+            "ok": ok,
+            "at": datetime.now(timezone.utc).isoformat(),
+        }]
+    )[-LATENCY_SAMPLES:]
+    latencies = [sample["seconds"] for sample in entry["samples"]]
+    entry["p50"] = _percentile(latencies, 0.5)
+    entry["p90"] = _percentile(latencies, 0.9)
+    try:
+        ensure_data_dir()
+        LATENCY_FILE.write_text(json.dumps(stats, indent=2))
+    except OSError as e:
+        logger.warning(f"Failed to save latency stats: {e}")
+
+
+def estimate_seconds(model: str, prompt_chars: int, pct: float = 0.9) -> float | None:
+    """Estimated latency for a prompt of this size, or None without enough recent history.
+
+    Each sample is scaled by sqrt(size ratio): output length dominates, so
+    latency grows sub-linearly with prompt size. Only samples from the last
+    LATENCY_MAX_AGE_DAYS count, so a tier that plan_models keeps skipping
+    gets retried once its slow samples expire.
+    """
+    samples = _fresh(load_latency().get(model, {}).get("samples", []))
+    if len(samples) < MIN_LATENCY_SAMPLES:
+        return None
+    scaled = [s["seconds"] * (prompt_chars / max(s["chars"], 1)) ** 0.5 for s in samples]
+    return _percentile(scaled, pct)
+
+
+def plan_models(prompt_chars: int, remaining: float) -> list[str]:
+    """Models to try in order: the first tier expected to fit the time budget, then cheaper ones."""
+    models = Config.SUMMARY_MODELS
+    for i, model in enumerate(models):
+        estimate = estimate_seconds(model, prompt_chars)
+        if estimate is None or estimate <= remaining:
+            return models[i:]
+        logger.info(f"Skipping {model}: p90 estimate {estimate:.0f}s > remaining {remaining:.0f}s")
+    return models[-1:]
+
+
+async def call_claude(
+    prompt: str,
+    model: str = "sonnet",
+    timeout: float = TIMEOUT_SECONDS,
+) -> str | None:
     """Call Claude CLI with the given prompt. Returns result or None on failure."""
     process = None
+    started = time.monotonic()
     try:
         # Remove CLAUDECODE env var to avoid nested session error
         env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
@@ -31,20 +123,23 @@ async def call_claude(prompt: str, model: str = "sonnet") -> str | None:
 
         stdout, stderr = await asyncio.wait_for(
             process.communicate(input=prompt.encode("utf-8")),
-            timeout=TIMEOUT_SECONDS,
+            timeout=timeout,
         )
 
         if process.returncode != 0:
             logger.error(f"Claude CLI error: {stderr.decode()[:500]}")
             return None
 
+        record_latency(model, len(prompt), time.monotonic() - started, ok=True)
         return stdout.decode("utf-8").strip()
 
     except asyncio.TimeoutError:
-        logger.error(f"Claude CLI timeout after {TIMEOUT_SECONDS}s")
+        logger.error(f"Claude CLI timeout after {timeout:.0f}s ({model})")
+        record_latency(model, len(prompt), timeout, ok=False)
         if process:
             try:
                 process.kill()
+                await process.wait()
             except Exception:
                 pass
         return None
@@ -56,33 +151,71 @@ async def call_claude(prompt: str, model: str = "sonnet") -> str | None:
         return None
 
 
+def _truncate(text: str, limit: int | None) -> str:
+    if limit is None or len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + "…"
+
+
+def _result_block(idx: int, r: CrawlResult, max_chars: int | None = None) -> str:
+    if r.ok:
+        return f"[{idx}] {r.title or 'Untitled'}\nURL: {r.url}\nAuthor: {r.author or 'Unknown'}\nType: {r.source_type}\n\n{_truncate(r.text, max_chars)}"
+    return f"[{idx}] Crawl failed\nURL: {r.url}\nError: {r.error}"
+
+
+def _message_block(idx: int, mt: dict, max_chars: int | None = None) -> str:
+    return f"[{idx}] Channel message\nChannel: {mt['channel']}\nDate: {mt['date']}\n\n{_truncate(mt['text'], max_chars)}"
+
+
+def _snippet(text: str, limit: int = RELATED_SNIPPET_CHARS) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+
+def _story_block(idx: int, cluster: Cluster, max_chars: int | None = None) -> str:
+    """One block for a multi-source story: the fullest text plus short related snippets."""
+    items: list[tuple[str, str]] = [(r.title or "Untitled", r.text) for r in cluster.results]
+    items += [(f"Channel message ({mt['channel']})", mt["text"]) for mt in cluster.messages]
+    primary = max(range(len(items)), key=lambda i: len(items[i][1]))
+    title, text = items[primary]
+
+    lines = [f"[{idx}] Story ({cluster.size} sources): {title}"]
+    if cluster.urls:
+        lines.append("URLs: " + ", ".join(cluster.urls))
+    lines.append("")
+    lines.append(_truncate(text, max_chars))
+    related = [f"- {t}: {_snippet(body)}" for i, (t, body) in enumerate(items) if i != primary]
+    if related:
+        lines.append("")
+        lines.append("Related:")
+        lines.extend(related)
+    return "\n".join(lines)
+
+
 def build_prompt(
     results: list[CrawlResult],
     message_texts: list[dict] | None = None,
+    prompt: str = DEFAULT_PROMPT,
+    max_item_chars: int | None = None,
 ) -> str:
-    """Build the summarization prompt from crawl results and message texts."""
-    template = PROMPT_TEMPLATE()
+    """Build the summarization prompt from crawl results and message texts.
 
-    content_blocks = []
-    idx = 1
+    Items about the same story are clustered and sent as one block.
+    ``max_item_chars`` truncates each item's text for a condensed prompt.
+    """
+    template = load_prompt(prompt)
 
-    # Crawled content
-    for r in results:
-        if r.ok:
-            block = f"[{idx}] {r.title or 'Untitled'}\nURL: {r.url}\nAuthor: {r.author or 'Unknown'}\nType: {r.source_type}\n\n{r.text}"
+    content_blocks = []
+    for idx, cluster in enumerate(cluster_items(results, message_texts), start=1):
+        if cluster.size > 1:
+            block = _story_block(idx, cluster, max_item_chars)
+        elif cluster.results:
+            block = _result_block(idx, cluster.results[0], max_item_chars)
         else:
-            block = f"[{idx}] Crawl failed\nURL: {r.url}\nError: {r.error}"
+            block = _message_block(idx, cluster.messages[0], max_item_chars)
         content_blocks.append(block)
-        idx += 1
 
-    # Message texts (no URL)
-    if message_texts:
-        for mt in message_texts:
-            block = f"[{idx}] Channel message\nChannel: {mt['channel']}\nDate: {mt['date']}\n\n{mt['text']}"
-            content_blocks.append(block)
-            idx += 1
-
-    total = idx - 1
+    total = len(content_blocks)
     today = datetime.now(timezone.utc).strftime("%Y년 %m월 %d일")
     content = "\n\n---\n\n".join(content_blocks)
     return (
@@ -96,16 +229,45 @@ def build_prompt(
 async def summarize(
     results: list[CrawlResult],
     message_texts: list[dict] | None = None,
+    prompt: str = DEFAULT_PROMPT,
 ) -> str | None:
-    """Summarize crawled content and message texts using Claude CLI."""
+    """Summarize crawled content and message texts using Claude CLI.
+
+    Walks the model cascade (Config.SUMMARY_MODELS) within the time budget:
+    tiers whose latency estimate doesn't fit are skipped, and after a
+    failure or timeout the next tier gets a condensed prompt.
+    """
     if not results and not message_texts:
         logger.info("No content to summarize")
         return None
 
-    prompt = build_prompt(results, message_texts)
-    logger.info(f"Summarizing {len(results)} crawled + {len(message_texts or [])} messages (prompt: {len(prompt)} chars)")
+    deadline = time.monotonic() + Config.SUMMARY_TIME_BUDGET
+    prompt_text = build_prompt(results, message_texts, prompt=prompt)
+    condensed = False
+    if len(prompt_text) > Config.SUMMARY_MAX_PROMPT_CHARS:
+        prompt_text = build_prompt(
+            results, message_texts, prompt=prompt,
+            max_item_chars=Config.SUMMARY_CONDENSED_ITEM_CHARS,
+        )
+        condensed = True
+    logger.info(f"Summarizing {len(results)} crawled + {len(message_texts or [])} messages (prompt: {len(prompt_text)} chars)")
+
+    models = plan_models(len(prompt_text), deadline - time.monotonic())
+    for i, model in enumerate(models):
+        remaining = deadline - time.monotonic()
+        if remaining < MIN_ATTEMPT_SECONDS:
+            logger.error(f"Summary time budget exhausted before trying {model}")
+            break
+        if i > 0 and not condensed:
+            prompt_text = build_prompt(
+                results, message_texts, prompt=prompt,
+                max_item_chars=Config.SUMMARY_CONDENSED_ITEM_CHARS,
+            )
+            condensed = True
+            logger.info(f"Falling back to {model} with condensed prompt ({len(prompt_text)} chars)")
 
-    summary = await call_claude(prompt)
-    if summary:
-        logger.info(f"Summary generated: {len(summary)} chars")
-    return summary
+        summary = await call_claude(prompt_text, model=model, timeout=min(TIMEOUT_SECONDS, remaining))
+        if summary:
+            logger.info(f"Summary generated by {model}: {len(summary)} chars")
+            return summary
+    return None
@@ -1,38 +1,169 @@
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from telethon import TelegramClient
+from telethon.errors import FloodWaitError
 from telethon.tl.types import Message
 
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+MAX_SHARD_RETRIES = 3
 
-async def read_messages(
+
+async def read_channel_messages(
     client: TelegramClient,
     since: datetime,
-) -> list[Message]:
-    """Read messages from all source channels since the given datetime."""
-    all_messages: list[Message] = []
+    channels: list[str],
+) -> dict[str, list[Message]]:
+    """Read messages from each channel since the given datetime, keyed by channel.
+
+    Large catch-up windows are read with the sharded backfill reader.
+    """
+    window = datetime.now(timezone.utc) - since
+    if window > timedelta(hours=Config.BACKFILL_THRESHOLD_HOURS):
+        logger.info(f"Catch-up window {window} exceeds threshold, using backfill reader")
+        by_channel = await read_backfill(client, since, channels)
+        for channel, messages in by_channel.items():
+            logger.info(f"Read {len(messages)} messages from {channel}")
+        return by_channel
 
-    for channel in Config.SOURCE_CHANNELS:
+    by_channel = {}
+    for channel in channels:
+        messages: list[Message] = []
         try:
             entity = await client.get_entity(channel)
-            count = 0
             async for msg in client.iter_messages(
                 entity,
                 offset_date=since,
                 reverse=True,
             ):
                 if isinstance(msg, Message) and msg.date > since:
-                    all_messages.append(msg)
-                    count += 1
-            logger.info(f"Read {count} messages from {channel}")
+                    messages.append(msg)
+            logger.info(f"Read {len(messages)} messages from {channel}")
         except Exception as e:
             logger.error(f"Failed to read {channel}: {e}")
+        by_channel[channel] = messages
+
+    return by_channel
+
+
+def _shard_bounds(since: datetime, until: datetime, hours: float) -> list[tuple[datetime, datetime]]:
+    """Split [since, until) into consecutive time shards."""
+    step = timedelta(hours=hours)
+    bounds = []
+    start = since
+    while start < until:
+        end = min(start + step, until)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+async def _read_shard(
+    reader: TelegramClient,
+    entity,
+    channel: str,
+    start: datetime,
+    end: datetime,
+    sem: asyncio.Semaphore,
+) -> list[Message]:
+    """Read one channel's messages in (start, end], retrying on FloodWait."""
+    for _ in range(MAX_SHARD_RETRIES):
+        messages: list[Message] = []
+        async with sem:
+            try:
+                async for msg in reader.iter_messages(
+                    entity,
+                    offset_date=start,
+                    reverse=True,
+                    wait_time=Config.BACKFILL_WAIT_TIME,
+                ):
+                    if msg.date > end:
+                        break
+                    if isinstance(msg, Message) and msg.date > start:
+                        messages.append(msg)
+                return messages
+            except FloodWaitError as e:
+                wait = e.seconds
+        logger.warning(f"FloodWait on {channel} shard {start:%m-%d %H:%M}: waiting {wait}s")
+        await asyncio.sleep(wait)
+
+    logger.error(f"Giving up on {channel} shard {start:%m-%d %H:%M} after {MAX_SHARD_RETRIES} FloodWaits")
+    return []
+
+
+async def read_backfill(
+    client: TelegramClient,
+    since: datetime,
+    channels: list[str],
+    until: datetime | None = None,
+) -> dict[str, list[Message]]:
+    """Read a large catch-up window as concurrent (channel, time shard) reads.
+
+    Shards run under a shared concurrency budget and are scheduled
+    oldest-first. Returns messages keyed by channel, each list in date order.
+    """
+    until = until or datetime.now(timezone.utc)
+    bounds = _shard_bounds(since, until, Config.BACKFILL_SHARD_HOURS)
+    sem = asyncio.Semaphore(Config.BACKFILL_CONCURRENCY)
+
+    # Takeout sessions get much higher limits for bulk export
+    reader = client
+    takeout = None
+    if Config.BACKFILL_TAKEOUT:
+        try:
+            takeout = client.takeout(channels=True, finalize=True)
+            reader = await takeout.__aenter__()
+        except Exception as e:
+            logger.warning(f"Takeout session unavailable ({e}), using regular client")
+            takeout = None
+
+    by_channel: dict[str, list[Message]] = {ch: [] for ch in channels}
+    tasks: list[tuple[str, asyncio.Task]] = []
+    try:
+        entities = {}
+        for channel in channels:
+            try:
+                entities[channel] = await reader.get_entity(channel)
+            except Exception as e:
+                logger.error(f"Failed to read {channel}: {e}")
+
+        logger.info(f"Backfill: {len(entities)} channels x {len(bounds)} shards")
+        # Tasks are created oldest shard first; the semaphore is FIFO, so early shards run first
+        tasks = [
+            (channel, asyncio.create_task(_read_shard(reader, entity, channel, start, end, sem)))
+            for start, end in bounds
+            for channel, entity in entities.items()
+        ]
+        results = await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+        for (channel, _), messages in zip(tasks, results):
+            if isinstance(messages, BaseException):
+                logger.error(f"Backfill shard failed for {channel}: {messages}")
+                continue
+            # Shards are in time order, so per-channel lists stay sorted
+            by_channel[channel].extend(messages)
+    finally:
+        pending = [task for _, task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if takeout:
+            await takeout.__aexit__(None, None, None)
+
+    return by_channel
+
+
+def merge_messages(
+    by_channel: dict[str, list[Message]],
+    channels: list[str] | None = None,
+) -> list[Message]:
+    """Flatten per-channel messages (optionally a subset of channels) sorted by date."""
+    merged: list[Message] = []
+    for channel in channels if channels is not None else by_channel:
+        merged.extend(by_channel.get(channel, []))
+    merged.sort(key=lambda m: m.date)
+    return merged
 
-    # Sort by date
-    all_messages.sort(key=lambda m: m.date)
-    logger.info(f"Total messages: {len(all_messages)}")
-    return all_messages
@@ -33,10 +33,8 @@ def split_message(text: str, max_len: int = MAX_MESSAGE_LENGTH) -> list[str]:
     return parts
 
 
-async def _resolve_output(client: TelegramClient) -> object:
+async def _resolve_output(client: TelegramClient, channel: str) -> object:
     """Resolve output channel — supports usernames and private invite links."""
-    channel = Config.OUTPUT_CHANNEL
-
     # Private invite link: https://t.me/+HASH or https://t.me/joinchat/HASH
     match = re.search(r"t\.me/\+([A-Za-z0-9_-]+)", channel) or \
             re.search(r"t\.me/joinchat/([A-Za-z0-9_-]+)", channel)
@@ -51,10 +49,15 @@ async def _resolve_output(client: TelegramClient) -> object:
     return await client.get_entity(channel)
 
 
-async def send_summary(client: TelegramClient, summary: str) -> bool:
-    """Send summary to the output channel in HTML format."""
+async def send_summary(
+    client: TelegramClient,
+    summary: str,
+    channel: str | None = None,
+) -> bool:
+    """Send summary to the output channel (Config.OUTPUT_CHANNEL by default) in HTML format."""
+    channel = channel or Config.OUTPUT_CHANNEL
     try:
-        entity = await _resolve_output(client)
+        entity = await _resolve_output(client, channel)
         parts = split_message(summary)
 
         for i, part in enumerate(parts):
@@ -66,8 +69,8 @@ async def send_summary(client: TelegramClient, summary: str) -> bool:
             )
             logger.info(f"Sent part {i + 1}/{len(parts)} ({len(part)} chars)")
 
-        logger.info(f"Summary sent to {Config.OUTPUT_CHANNEL}")
+        logger.info(f"Summary sent to {channel}")
         return True
     except Exception as e:
-        logger.error(f"Failed to send summary: {e}")
+        logger.error(f"Failed to send summary to {channel}: {e}")
         return False
@@ -0,0 +1,248 @@
+import asyncio
+import multiprocessing
+import time
+
+from src.crawlers.base import CrawlResult
+from src.crawlers.queue import CrawlQueue
+
+URLS = [f"https://example.com/{i}" for i in range(60)]
+
+
+def _drain(path: str, worker: str, claimed) -> None:
+    """Worker process: claim and complete jobs until the queue is empty."""
+    queue = CrawlQueue(path, lease_seconds=60)
+    try:
+        while jobs := queue.claim(worker, limit=3):
+            for job_id, url in jobs:
+                claimed.put(job_id)
+                queue.complete(job_id, worker, CrawlResult(url=url, text=worker))
+    finally:
+        queue.close()
+
+
+def _claim_and_die(path: str, worker: str, lease_seconds: float) -> None:
+    """Worker process that takes a lease and exits without completing it."""
+    queue = CrawlQueue(path, lease_seconds=lease_seconds)
+    queue.claim(worker, limit=1)
+    queue.close()
+
+
+def _run(target, *args) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    proc = ctx.Process(target=target, args=args)
+    proc.start()
+    proc.join(30)
+    assert proc.exitcode == 0
+
+
+def test_concurrent_workers_claim_each_job_once(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = CrawlQueue(path)
+    queue.enqueue("b1", URLS)
+
+    ctx = multiprocessing.get_context("spawn")
+    claimed = ctx.Queue()
+    procs = [ctx.Process(target=_drain, args=(path, f"w{i}", claimed)) for i in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(60)
+        assert proc.exitcode == 0
+
+    ids = [claimed.get(timeout=5) for _ in range(len(URLS))]
+    assert claimed.empty()
+    assert len(set(ids)) == len(URLS)
+
+    results = queue.results("b1")
+    assert set(results) == set(URLS)
+    assert all(r.ok for r in results.values())
+    assert queue.conn.execute("SELECT MAX(attempts) FROM jobs").fetchone() == (1,)
+    queue.close()
+
+
+def test_expired_lease_is_reclaimed_and_stale_completion_ignored(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = CrawlQueue(path, lease_seconds=60)
+    queue.enqueue("b1", URLS[:1])
+
+    _run(_claim_and_die, path, "dead", 0.1)
+    time.sleep(0.2)
+
+    [(job_id, url)] = queue.claim("alive")
+    # The dead worker's late writes must not touch the new lease
+    queue.complete(job_id, "dead", CrawlResult(url=url, text="stale"))
+    queue.fail(job_id, "dead", "boom")
+    queue.complete(job_id, "alive", CrawlResult(url=url, text="fresh"))
+
+    assert queue.results("b1")[url].text == "fresh"
+    queue.close()
+
+
+def test_lease_expiry_after_max_attempts_fails_job(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = CrawlQueue(path, max_attempts=1)
+    queue.enqueue("b1", URLS[:1])
+
+    _run(_claim_and_die, path, "dead", 0.1)
+    time.sleep(0.2)
+
+    assert queue.claim("alive") == []
+    assert queue.results("b1")[URLS[0]].error == "lease_expired"
+    queue.close()
+
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    queue = CrawlQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    queue.enqueue("b1", URLS[:1])
+
+    [(job_id, url)] = queue.claim("w")
+    queue.fail(job_id, "w", "boom")
+    assert queue.results("b1") == {}
+
+    [(job_id, url)] = queue.claim("w")
+    queue.fail(job_id, "w", "boom")
+    assert queue.results("b1")[url].error == "boom"
+    queue.close()
+
+
+def test_extend_keeps_lease_until_renewals_stop(tmp_path):
+    queue = CrawlQueue(str(tmp_path / "queue.db"), lease_seconds=0.2)
+    queue.enqueue("b1", URLS[:1])
+
+    [(job_id, _)] = queue.claim("slow")
+    for _ in range(4):
+        time.sleep(0.1)
+        assert queue.extend([job_id], "slow") == 1
+        assert queue.claim("other") == []
+
+    time.sleep(0.3)
+    assert queue.claim("other") == [(job_id, URLS[0])]
+    assert queue.extend([job_id], "slow") == 0
+    queue.close()
+
+
+def test_process_queue_jobs_renews_leases_during_slow_batch(tmp_path, monkeypatch):
+    from src.crawlers import router
+
+    path = str(tmp_path / "queue.db")
+    queue = CrawlQueue(path, lease_seconds=0.15)
+    queue.enqueue("b1", URLS[:2])
+    other = CrawlQueue(path, lease_seconds=0.15)
+    stolen = []
+
+    async def slow_crawl(urls, render_pool=None, breaker=None):
+        for _ in range(5):
+            await asyncio.sleep(0.1)
+            stolen.extend(other.claim("other", limit=2))
+        return [CrawlResult(url=url, text="ok") for url in urls]
+
+    monkeypatch.setattr(router, "crawl_local", slow_crawl)
+    assert asyncio.run(router.process_queue_jobs(queue, "slow")) == 2
+
+    assert stolen == []
+    assert {r.text for r in queue.results("b1").values()} == {"ok"}
+    other.close()
+    queue.close()
+
+
+def test_coordinator_returns_at_deadline_despite_slow_local_batch(tmp_path, monkeypatch):
+    from src.config import Config
+    from src.crawlers import router
+
+    async def stuck_crawl(urls, render_pool=None, breaker=None):
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(router, "crawl_local", stuck_crawl)
+    monkeypatch.setattr(router, "CrawlQueue", lambda: CrawlQueue(str(tmp_path / "queue.db")))
+    monkeypatch.setattr(Config, "CRAWL_QUEUE_DEADLINE", 0.5)
+    monkeypatch.setattr(Config, "CRAWL_QUEUE_LOCAL_WORK", True)
+    monkeypatch.setattr(Config, "CRAWL_QUEUE_LISTEN", "")
+    monkeypatch.setattr(router, "HostCircuitBreaker", lambda: _NoBreaker())
+
+    started = time.monotonic()
+    results = asyncio.run(router.crawl_via_queue(URLS[:3]))
+
+    assert time.monotonic() - started < 5
+    assert [r.error for r in results] == ["queue_deadline"] * 3
+
+
+class _NoBreaker:
+    def close(self):
+        pass
+
+
+
+def test_queue_lock_wait_does_not_block_event_loop(tmp_path, monkeypatch):
+    from src.crawlers import router
+    from src.crawlers.db import connect
+
+    async def fast_crawl(urls, render_pool=None, breaker=None):
+        return [CrawlResult(url=url, text="ok") for url in urls]
+
+    monkeypatch.setattr(router, "crawl_local", fast_crawl)
+    path = str(tmp_path / "queue.db")
+    queue = CrawlQueue(path)
+    queue.enqueue("b", URLS[:2])
+    locker = connect(path)
+    locker.execute("BEGIN IMMEDIATE")  # another process mid-transaction
+
+    async def scenario():
+        work = asyncio.create_task(router.process_queue_jobs(queue, "w"))
+        started = time.monotonic()
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+        stalled = time.monotonic() - started
+        locker.execute("COMMIT")
+        return stalled, await work
+
+    stalled, processed = asyncio.run(scenario())
+    assert stalled < 5  # the claim waits up to 30s for the lock
+    assert processed == 2
+    assert [r.text for r in queue.results("b").values()] == ["ok", "ok"]
+    locker.close()
+    queue.close()
+
+
+def test_grouped_jobs_are_claimed_together(tmp_path):
+    queue = CrawlQueue(str(tmp_path / "queue.db"))
+    a, b = "https://x.com/alice/status/1", "https://x.com/alice/status/2"
+    queue.enqueue("b1", [a, URLS[0], URLS[1], b], groups={a: "0", b: "0"})
+    queue.enqueue("b2", URLS[2:4], groups={URLS[2]: "0", URLS[3]: "0"})  # keys are per batch
+
+    assert [url for _, url in queue.claim("w1", limit=2)] == [a, URLS[0], b]
+    assert [url for _, url in queue.claim("w2", limit=2)] == [URLS[1], URLS[2], URLS[3]]
+    queue.close()
+
+
+def test_queue_file_without_groups_is_migrated(tmp_path):
+    from src.crawlers.db import connect
+
+    path = str(tmp_path / "queue.db")
+    old = connect(path)
+    old.execute(
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY, batch TEXT NOT NULL, url TEXT NOT NULL,"
+        " state TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0,"
+        " lease_owner TEXT, lease_expires REAL, result TEXT, created_at REAL NOT NULL,"
+        " UNIQUE (batch, url))"
+    )
+    old.close()
+
+    queue = CrawlQueue(path)
+    queue.enqueue("b1", URLS[:2], groups={URLS[0]: "0", URLS[1]: "0"})
+    assert len(queue.claim("w", limit=1)) == 2
+    queue.close()
+
+
+def test_abandoned_batches_expire(tmp_path):
+    path = str(tmp_path / "queue.db")
+    killed = CrawlQueue(path, batch_ttl=0.1)
+    killed.enqueue("dead", URLS[:2])  # coordinator dies without dropping it
+    killed.close()
+    time.sleep(0.2)
+
+    queue = CrawlQueue(path, batch_ttl=0.1)
+    assert queue.claim("w", limit=5) == []
+    queue.enqueue("live", URLS[2:3])
+    assert [url for _, url in queue.claim("w", limit=5)] == URLS[2:3]
+    assert queue.conn.execute("SELECT DISTINCT batch FROM jobs").fetchall() == [("live",)]
+    queue.close()
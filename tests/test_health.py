@@ -0,0 +1,65 @@
+from src.crawlers.base import CrawlResult
+from src.crawlers.health import CIRCUIT_ERROR_PREFIX, HostCircuitBreaker
+
+URL = "https://flaky.example/post"
+
+
+def _fail(breaker: HostCircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.record(URL, CrawlResult(url=URL, error="http_503"))
+
+
+def test_circuit_opens_after_threshold_and_is_shared(tmp_path):
+    path = tmp_path / "health.db"
+    a = HostCircuitBreaker(path, threshold=3, cooldown_hours=1)
+    b = HostCircuitBreaker(path, threshold=3, cooldown_hours=1)
+
+    _fail(a, 2)
+    assert b.check(URL) is None
+    _fail(b, 1)
+
+    cached = a.check("https://www.flaky.example/other")
+    assert cached.error == f"{CIRCUIT_ERROR_PREFIX}: http_503"
+    a.close()
+    b.close()
+
+
+def test_half_open_allows_one_probe_across_processes(tmp_path):
+    path = tmp_path / "health.db"
+    a = HostCircuitBreaker(path, threshold=1, cooldown_hours=0)
+    b = HostCircuitBreaker(path, threshold=1, cooldown_hours=0)
+    _fail(a, 1)
+
+    assert a.check(URL) is None  # a holds the probe
+    assert b.check(URL).error.startswith(CIRCUIT_ERROR_PREFIX)
+
+    a.record(URL, CrawlResult(url=URL, error="timeout"))  # failed probe re-opens
+    assert b.check(URL) is None  # cooldown 0: b may probe next
+    b.record(URL, CrawlResult(url=URL, text="ok"))  # successful probe closes
+
+    assert a.check(URL) is None
+    assert b.check(URL) is None
+    a.close()
+    b.close()
+
+
+def test_url_errors_do_not_count(tmp_path):
+    breaker = HostCircuitBreaker(tmp_path / "health.db", threshold=1)
+    breaker.record(URL, CrawlResult(url=URL, error="http_404"))
+    assert breaker.check(URL) is None
+    breaker.close()
+
+
+def test_probe_answered_with_url_error_closes_circuit(tmp_path):
+    path = tmp_path / "health.db"
+    a = HostCircuitBreaker(path, threshold=1, cooldown_hours=0)
+    b = HostCircuitBreaker(path, threshold=1, cooldown_hours=0)
+    _fail(a, 1)
+
+    assert a.check(URL) is None  # a holds the probe
+    a.record(URL, CrawlResult(url=URL, error="http_404"))
+
+    assert b.check(URL) is None
+    assert b.conn.execute("SELECT COUNT(*) FROM hosts").fetchone() == (0,)
+    a.close()
+    b.close()
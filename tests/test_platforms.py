@@ -0,0 +1,99 @@
+import json
+
+from src.crawlers.platforms import _html_to_text, _parse_medium, _parse_mirror, _parse_substack
+
+BODY = " ".join(["Ethereum developers confirmed the upgrade date on today's core call."] * 5)
+
+
+def _page(head: str = "", body: str = "") -> str:
+    return f"<html><head>{head}</head><body>{body}</body></html>"
+
+
+def _json_ld(obj: dict) -> str:
+    return f'<script type="application/ld+json">{json.dumps(obj)}</script>'
+
+
+def _apollo(state: dict) -> str:
+    return f"<script>window.__APOLLO_STATE__ = {json.dumps(state)}</script>"
+
+
+def test_html_to_text_emits_nested_blocks_once():
+    assert _html_to_text("<ul><li><p>nested</p></li></ul>") == "nested"
+    assert _html_to_text("<blockquote><p>quoted</p></blockquote><p>after</p>") == "quoted\n\nafter"
+    assert _html_to_text("<ul><li>one</li><li>two</li></ul>") == "one\n\ntwo"
+
+
+def test_medium_uses_post_matching_url_id():
+    state = {
+        "Post:1a2b3c4d5e6f": {
+            "title": "The upgrade",
+            "content({})": {"bodyModel": {"paragraphs": [{"__ref": "Paragraph:a"}]}},
+        },
+        "Post:ffffffffffff": {
+            "title": "Recommended post",
+            "content({})": {"bodyModel": {"paragraphs": [{"__ref": "Paragraph:b"}]}},
+        },
+        "Paragraph:a": {"text": BODY},
+        "Paragraph:b": {"text": "Unrelated recommended post body."},
+        "User:1": {"name": "Alice"},
+    }
+    html = _page(body=_apollo(state))
+
+    result = _parse_medium("https://medium.com/@alice/the-upgrade-1a2b3c4d5e6f", html)
+
+    assert result.title == "The upgrade"
+    assert result.author == "Alice"
+    assert result.text == BODY
+    assert "Unrelated" not in result.text
+
+
+def test_medium_falls_back_to_all_paragraphs():
+    state = {
+        "Post:ffffffffffff": {"title": "Other"},
+        "Paragraph:a": {"text": BODY},
+        "Paragraph:b": {"text": "Second paragraph."},
+    }
+    html = _page(
+        head=_json_ld({"@type": "Article", "headline": "JSON-LD title", "author": {"name": "Bob"}}),
+        body=_apollo(state),
+    )
+
+    result = _parse_medium("https://medium.com/p/unknown-slug", html)
+
+    assert result.title == "JSON-LD title"
+    assert result.author == "Bob"
+    assert result.text == f"{BODY}\n\nSecond paragraph."
+
+
+def test_substack_reads_json_ld():
+    html = _page(head=_json_ld({
+        "@context": "https://schema.org",
+        "@graph": [
+            {"@type": "WebSite", "name": "Newsletter"},
+            {"@type": "NewsArticle", "headline": "Weekly wrap", "author": [{"name": "Carol"}],
+             "articleBody": BODY},
+        ],
+    }))
+
+    result = _parse_substack("https://example.substack.com/p/weekly-wrap", html)
+
+    assert (result.title, result.author, result.source_type) == ("Weekly wrap", "Carol", "substack")
+    assert result.text == BODY
+
+
+def test_substack_without_body_returns_none():
+    html = _page(head=_json_ld({"@type": "NewsArticle", "headline": "Paywalled"}))
+    assert _parse_substack("https://example.substack.com/p/paywalled", html) is None
+
+
+def test_mirror_picks_longest_entry_from_next_data():
+    data = {"props": {"pageProps": {
+        "digest": {"title": "Teaser", "body": "short"},
+        "entry": {"title": "Mirror post", "body": BODY, "author": {"displayName": "Dave"}},
+    }}}
+    html = _page(body=f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>')
+
+    result = _parse_mirror("https://mirror.xyz/dave.eth/abc", html)
+
+    assert (result.title, result.author, result.source_type) == ("Mirror post", "Dave", "mirror")
+    assert result.text == BODY
@@ -0,0 +1,54 @@
+import pytest
+
+from src.crawlers.base import CrawlResult
+from src.crawlers.queue import CrawlQueue
+from src.crawlers.queue_http import QueueServer, RemoteCrawlQueue
+
+TOKEN = "secret"
+
+
+@pytest.fixture
+def served(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = CrawlQueue(path, lease_seconds=60)
+    server = QueueServer("127.0.0.1:0", TOKEN, path)
+    server.start()
+    host, port = server.httpd.server_address[:2]
+    yield queue, f"http://{host}:{port}"
+    server.stop()
+    queue.close()
+
+
+def test_remote_worker_round_trip(served):
+    queue, url = served
+    queue.enqueue("b1", ["https://example.com/a", "https://example.com/b"])
+    remote = RemoteCrawlQueue(url, TOKEN)
+
+    jobs = remote.claim("remote", limit=5)
+    assert [u for _, u in jobs] == ["https://example.com/a", "https://example.com/b"]
+    assert queue.claim("local") == []
+    assert remote.extend([job_id for job_id, _ in jobs], "remote") == 2
+
+    remote.complete(jobs[0][0], "remote", CrawlResult(url=jobs[0][1], text="body"))
+    remote.fail(jobs[1][0], "remote", "boom")
+
+    assert queue.results("b1")["https://example.com/a"].text == "body"
+    assert queue.claim("local") == [jobs[1]]  # failed job went back to pending
+    remote.close()
+
+
+def test_wrong_token_is_rejected(served):
+    queue, url = served
+    queue.enqueue("b1", ["https://example.com/a"])
+    remote = RemoteCrawlQueue(url, "wrong")
+
+    assert remote.claim("remote") == []
+    assert len(queue.claim("local")) == 1
+    remote.close()
+
+
+def test_unreachable_server_reads_as_empty_queue():
+    remote = RemoteCrawlQueue("http://127.0.0.1:9", TOKEN)
+    assert remote.claim("remote") == []
+    assert remote.extend([1], "remote") == 0
+    remote.close()
@@ -0,0 +1,42 @@
+import pytest
+
+from src.scoring import REFERRAL_WEIGHT, _lexicon_score, _url_score
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.bybit.com/register?affiliate_id=1",
+    "https://exchange.example/en/signup/",
+    "https://exchange.example/join",
+    "https://exchange.example/activity/referral/abc",
+    "https://exchange.example/markets?referralCode=XYZ",
+])
+def test_referral_links_are_penalised(url):
+    assert _url_score(url, {}) == REFERRAL_WEIGHT
+
+
+@pytest.mark.parametrize("url", [
+    "https://blog.example/join-us-for-ethcc",
+    "https://blog.example/registered-investment-advisers",
+    "https://github.com/org/repo/blob/main/README.md?code=1",
+    "https://news.example/invite-only-beta-launches",
+    "https://thedefiant.io/news/defi/aave-v4?ref=cryptonews.com",
+    "https://www.theblock.co/post/1?ref=x",
+])
+def test_ordinary_links_are_not_penalised(url):
+    assert _url_score(url, {}) == 0
+
+
+@pytest.mark.parametrize("text", [
+    "Claim your free USDT bonus, referral code inside",
+    "레퍼럴 코드로 가입 이벤트 참여",
+])
+def test_spam_text_scores_negative(text):
+    assert _lexicon_score(text) < 0
+
+
+@pytest.mark.parametrize("text", [
+    "Arbitrum airdrop claim now live for eligible wallets",
+    "Aave v4 upgrade approved by governance",
+])
+def test_news_text_does_not_score_negative(text):
+    assert _lexicon_score(text) >= 0
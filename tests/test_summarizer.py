@@ -0,0 +1,39 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src import summarizer
+from src.config import Config
+
+
+@pytest.fixture(autouse=True)
+def latency_file(tmp_path, monkeypatch):
+    path = tmp_path / "model_latency.json"
+    monkeypatch.setattr(summarizer, "LATENCY_FILE", path)
+    monkeypatch.setattr(Config, "SUMMARY_MODELS", ["sonnet", "haiku"])
+    return path
+
+
+def _write_samples(path, model: str, seconds: float, age: timedelta):
+    at = (datetime.now(timezone.utc) - age).isoformat()
+    samples = [{"chars": 10_000, "seconds": seconds, "ok": False, "at": at}] * 5
+    path.write_text(json.dumps({model: {"samples": samples}}))
+
+
+def test_slow_tier_is_skipped_while_samples_are_recent(latency_file):
+    _write_samples(latency_file, "sonnet", 900, timedelta(hours=1))
+    assert summarizer.plan_models(10_000, remaining=600) == ["haiku"]
+
+
+def test_skipped_tier_is_retried_once_samples_expire(latency_file):
+    _write_samples(latency_file, "sonnet", 900, timedelta(days=summarizer.LATENCY_MAX_AGE_DAYS + 1))
+    assert summarizer.plan_models(10_000, remaining=600) == ["sonnet", "haiku"]
+
+
+def test_record_latency_drops_expired_samples(latency_file):
+    _write_samples(latency_file, "sonnet", 900, timedelta(days=summarizer.LATENCY_MAX_AGE_DAYS + 1))
+    summarizer.record_latency("sonnet", 10_000, 120, ok=True)
+
+    samples = json.loads(latency_file.read_text())["sonnet"]["samples"]
+    assert [s["seconds"] for s in samples] == [120]
@@ -0,0 +1,68 @@
+import asyncio
+
+from src.crawlers import twitter
+from src.crawlers.twitter import MAX_BATCH_URLS, crawl_twitter_group, group_status_urls
+
+
+def _status(handle: str, status_id: int) -> str:
+    return f"https://x.com/{handle}/status/{status_id}"
+
+
+def test_group_status_urls_keeps_authors_together_within_batch_size():
+    urls = [_status("alice", i) for i in range(3)] + [_status("bob", i) for i in range(MAX_BATCH_URLS)]
+    urls += [_status("carol", 1), "https://x.com/i/web/status/7", "https://x.com/dave"]
+
+    batches = group_status_urls(urls)
+
+    assert sorted(u for b in batches for u in b) == sorted(urls)
+    assert all(len(b) <= MAX_BATCH_URLS for b in batches)
+    for handle in ("alice", "bob"):
+        assert sum(any(f"/{handle}/" in u for u in b) for b in batches) == 1
+
+
+class FakePage:
+    """Each URL "renders" the statuses listed for it in dom (id -> text)."""
+
+    def __init__(self, dom: dict[str, dict[str, str]]):
+        self.dom = dom
+        self.loaded: list[str] = []
+
+    async def evaluate(self, _js, ids):
+        page = self.dom.get(self.loaded[-1], {})
+        return {i: {"text": page[i], "author": "A"} for i in ids if i in page}
+
+
+class FakeBrowser:
+    def __init__(self, page: FakePage):
+        self.page = page
+
+    async def new_context(self, **_):
+        return self
+
+    async def add_init_script(self, _):
+        pass
+
+    async def new_page(self):
+        return self.page
+
+    async def close(self):
+        pass
+
+
+def test_crawl_twitter_group_reads_replies_and_quotes_from_loaded_pages(monkeypatch):
+    thread = [_status("alice", 1), _status("alice", 2), _status("alice", 3)]
+    quote = _status("bob", 10)
+    reply = _status("carol", 11)  # replies to bob/10, whose page renders both
+    page = FakePage({
+        thread[2]: {"1": "one", "2": "two", "3": "three"},
+        reply: {"10": "bob quoting", "11": "carol replying"},
+    })
+
+    async def load(p, url):
+        p.loaded.append(url)
+
+    monkeypatch.setattr(twitter, "_load_status", load)
+    results = asyncio.run(crawl_twitter_group([*thread, quote, reply], FakeBrowser(page)))
+
+    assert [r.text for r in results] == ["one", "two", "three", "bob quoting", "carol replying"]
+    assert page.loaded == [thread[2], reply]